@@ -2,7 +2,6 @@
 Admin handlers for tournament management
 """
 
-import json
 import logging
 from typing import List, Dict, Any
 import aiohttp
@@ -12,7 +11,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from bot.storage import DataStorage
-from bot.localization import Localizer
+from bot.localization import Localizer, detect_language
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +23,16 @@ class AdminHandlers:
         self.storage = storage
         self.localizer = localizer
         self.admins = admins
+        self._admin_set = frozenset(admin.lstrip('@').lower() for admin in admins)
     
     def _is_admin(self, username: str) -> bool:
         """Check if user is an admin"""
-        if not username:
-            return False
-        clean_username = username.lstrip('@').lower()
-        return clean_username in [admin.lower() for admin in self.admins]
+        return bool(username) and username.lstrip('@').lower() in self._admin_set
     
     async def list_players(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """List all registered players"""
         user = update.effective_user
-        lang = user.language_code if user.language_code in ["en", "ru"] else "en"
+        lang = detect_language(user.language_code)
         
         if not self._is_admin(user.username):
             error_text = self.localizer.get_text("admin_only", lang)
@@ -55,7 +52,7 @@ class AdminHandlers:
                 for username, data in vsa_players.items():
                     status = "✅" if data.get("confirmed") else "⏳"
                     message_parts.append(
-                        f"{status} @{username}: {data['name']} ({data['stars']} ⭐)"
+                        f"{status} @{data.get('username', username)}: {data['name']} ({data['stars']} ⭐)"
                     )
             else:
                 message_parts.append("VSA Tournament: No registrations")
@@ -69,7 +66,7 @@ class AdminHandlers:
                 for username, data in h2h_players.items():
                     status = "✅" if data.get("confirmed") else "⏳"
                     message_parts.append(
-                        f"{status} @{username}: {data['name']} ({data['stars']} ⭐)"
+                        f"{status} @{data.get('username', username)}: {data['name']} ({data['stars']} ⭐)"
                     )
             else:
                 message_parts.append("H2H Tournament: No registrations")
@@ -77,7 +74,7 @@ class AdminHandlers:
             await update.message.reply_text("\n".join(message_parts))
             
         except Exception as e:
-            logger.error(f"Error listing players: {e}")
+            logger.error("Error listing players: %s", e)
             error_text = self.localizer.get_text("list_players_error", lang)
             await update.message.reply_text(error_text)
 
@@ -101,6 +98,6 @@ async def set_bot_commands(bot_token: str):
                 if result.get("ok"):
                     logger.info("✅ Bot commands set successfully")
                 else:
-                    logger.error(f"❌ Failed to set commands: {result}")
+                    logger.error("❌ Failed to set commands: %s", result)
     except Exception as e:
-        logger.error(f"❌ Error setting commands: {e}")
+        logger.error("❌ Error setting commands: %s", e)
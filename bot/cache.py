@@ -0,0 +1,73 @@
+"""
+In-memory caches for per-user bot state
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, MutableMapping, Optional, Tuple
+
+
+class TTLCache(MutableMapping):
+    """
+    Bounded mapping with least-recently-used eviction and an idle timeout
+
+    Entries expire once they have not been read or written for `ttl`
+    seconds, and the least recently used entry is dropped when the cache
+    grows beyond `maxsize`.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds of inactivity after which an entry expires
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        """Drop entries idle for longer than the TTL (oldest first)"""
+        cutoff = now - self.ttl
+        while self._data:
+            key, (touched_at, _) = next(iter(self._data.items()))
+            if touched_at > cutoff:
+                break
+            del self._data[key]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        self._expire(now)
+        _, value = self._data[key]
+        self._data[key] = (now, value)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        self._data[key] = (now, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        self._expire(time.monotonic())
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        self._expire(time.monotonic())
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
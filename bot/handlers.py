@@ -3,14 +3,14 @@ Main bot handlers for user interactions and commands
 """
 
 import logging
+import time
 from typing import Dict, Any, Optional
-from datetime import datetime
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from bot.storage import DataStorage
-from bot.localization import Localizer
+from bot.storage import DataStorage, tournament_label
+from bot.localization import Localizer, detect_language
 from bot.nlp import NLPProcessor
 from bot.validation import ValidationError, validate_team_name, validate_rating
 
@@ -28,7 +28,7 @@ class BotHandlers:
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command"""
         user = update.effective_user
-        lang = user.language_code if user.language_code in ["en", "ru"] else "en"
+        lang = detect_language(user.language_code)
         
         welcome_text = self.localizer.get_text("welcome_message", lang)
         instructions_text = self.localizer.get_text("instructions", lang)
@@ -56,12 +56,12 @@ class BotHandlers:
             parse_mode='HTML'
         )
         
-        logger.info(f"User {user.username} ({user.id}) started the bot")
+        logger.info("User %s (%s) started the bot", user.username, user.id)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /help command"""
         user = update.effective_user
-        lang = user.language_code if user.language_code in ["en", "ru"] else "en"
+        lang = detect_language(user.language_code)
         
         help_text = self.localizer.get_text("help_message", lang)
         examples_text = self.localizer.get_text("command_examples", lang)
@@ -74,9 +74,9 @@ class BotHandlers:
         """Process natural language messages"""
         user = update.effective_user
         message_text = update.message.text
-        lang = user.language_code if user.language_code in ["en", "ru"] else "en"
+        lang = detect_language(user.language_code)
         
-        logger.info(f"Processing message from {user.username}: {message_text}")
+        logger.info("Processing message from %s: %s", user.username, message_text)
         
         try:
             # Parse the message using NLP processor
@@ -92,7 +92,7 @@ class BotHandlers:
             await self._handle_parsed_command(update, context, parsed_command, lang)
             
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             error_text = self.localizer.get_text("processing_error", lang)
             await update.message.reply_text(error_text)
     
@@ -142,7 +142,7 @@ class BotHandlers:
                 context.user_data["registration_data"] = {}
             
             context.user_data["registration_data"]["team_name"] = team_name
-            context.user_data["registration_data"]["timestamp"] = datetime.now()
+            context.user_data["registration_data"]["timestamp"] = time.monotonic()
             
             success_text = self.localizer.get_text(
                 "team_name_saved", 
@@ -153,7 +153,7 @@ class BotHandlers:
             
             await update.message.reply_text(f"{success_text}\n\n{next_step_text}")
             
-            logger.info(f"User {user.username} set team name: {team_name}")
+            logger.info("User %s set team name: %s", user.username, team_name)
             
         except ValidationError as e:
             error_text = self.localizer.get_text("validation_error", lang).format(error=str(e))
@@ -183,7 +183,7 @@ class BotHandlers:
             
             # Store rating
             registration_data[f"{tournament_type}_rating"] = rating
-            registration_data["timestamp"] = datetime.now()
+            registration_data["timestamp"] = time.monotonic()
             
             # Check if registration is complete for this tournament
             team_name = registration_data["team_name"]
@@ -191,7 +191,7 @@ class BotHandlers:
             success_text = self.localizer.get_text(
                 "rating_saved",
                 lang
-            ).format(tournament=tournament_type.upper(), rating=rating)
+            ).format(tournament=tournament_label(tournament_type), rating=rating)
             
             # Save to temporary storage
             await self.storage.save_temp_registration(
@@ -206,7 +206,7 @@ class BotHandlers:
             
             await update.message.reply_text(f"{success_text}\n\n{confirm_text}")
             
-            logger.info(f"User {user.username} set {tournament_type} rating: {rating}")
+            logger.info("User %s set %s rating: %s", user.username, tournament_type, rating)
             
         except ValidationError as e:
             error_text = self.localizer.get_text("validation_error", lang).format(error=str(e))
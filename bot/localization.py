@@ -2,11 +2,35 @@
 Localization module for multi-language support
 """
 
+import functools
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from bot.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Parameter types whose formatted text is memoized. Exact types only: 1, 1.0
+# and True hash equal but format differently, so they must not share a key.
+_MEMO_TYPES = (str, int)
+
+
+@functools.lru_cache(maxsize=64)
+def detect_language(language_code: Optional[str]) -> str:
+    """
+    Map a Telegram language code to a bot language
+
+    Russian variants (ru, ru-RU, ...) get Russian, everything else English.
+    Results are cached per code, so repeat users skip the check entirely.
+
+    Args:
+        language_code: Telegram user language code, possibly None
+
+    Returns:
+        "ru" or "en"
+    """
+    return "ru" if language_code and language_code[:2] == "ru" else "en"
+
 
 class Localizer:
     """Handles multi-language text for the bot"""
@@ -68,6 +92,12 @@ class Localizer:
                 "confirmation_failed": "❌ Failed to confirm registration.",
                 "use_admin_command": "ℹ️ Admins should use proper admin commands for confirmations.",
 
+                # Admin /list sections (HTML)
+                "list_vsa_header": "🏆 <b>VSA Tournament:</b>",
+                "list_h2h_header": "⚔️ <b>H2H Tournament:</b>",
+                "list_pending_header": "⏳ <b>Pending Confirmations:</b>",
+                "list_empty": "No registrations",
+
                 # Status messages
                 "bot_starting": "🚀 Bot is starting up...",
                 "bot_ready": "✅ Bot is ready and running!"
@@ -128,12 +158,50 @@ class Localizer:
                 "confirmation_failed": "❌ Не удалось подтвердить регистрацию.",
                 "use_admin_command": "ℹ️ Администраторы должны использовать специальные команды для подтверждений.",
 
+                # Admin /list sections (HTML)
+                "list_vsa_header": "🏆 <b>VSA Турнир:</b>",
+                "list_h2h_header": "⚔️ <b>H2H Турнир:</b>",
+                "list_pending_header": "⏳ <b>Ожидают подтверждения:</b>",
+                "list_empty": "Нет регистраций",
+
                 # Status messages
                 "bot_starting": "🚀 Бот запускается...",
                 "bot_ready": "✅ Бот готов к работе!"
             }
         }
 
+        # Resolved (key, language) -> template, cleared by add_text
+        self._template_cache: Dict[Tuple[str, str], str] = {}
+
+        # (key, language, sorted kwargs) -> formatted text, cleared by add_text.
+        # Bounded because the values include user input such as team names.
+        # Only str/int parameters are cached (see _MEMO_TYPES).
+        self._formatted_cache = TTLCache(maxsize=1024, ttl=3600)
+
+    def get_template(self, key: str, language: str = "en") -> str:
+        """
+        Get the unformatted localized text, with English fallback
+
+        Args:
+            key: Text key
+            language: Language code
+
+        Returns:
+            Text template
+        """
+        cache_key = (key, language)
+        text = self._template_cache.get(cache_key)
+        if text is None:
+            # Fallback to English if language not supported
+            texts = self.texts.get(language, self.texts["en"])
+
+            # Get text with fallback to English
+            text = texts.get(key)
+            if not text:
+                text = self.texts["en"].get(key, f"Missing text: {key}")
+            self._template_cache[cache_key] = text
+        return text
+
     def get_text(self, key: str, language: str = "en", **kwargs) -> str:
         """
         Get localized text
@@ -146,23 +214,28 @@ class Localizer:
         Returns:
             Localized text
         """
-        # Fallback to English if language not supported
-        if language not in self.texts:
-            language = "en"
+        text = self.get_template(key, language)
+        if not kwargs:
+            return text
 
-        # Get text with fallback to English
-        text = self.texts[language].get(key)
-        if not text:
-            text = self.texts["en"].get(key, f"Missing text: {key}")
+        cache_key = None
+        if all(type(value) in _MEMO_TYPES for value in kwargs.values()):
+            cache_key = (key, language, tuple(sorted(kwargs.items())))
+            cached = self._formatted_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         # Format with provided parameters
         try:
-            return text.format(**kwargs)
+            formatted = text.format(**kwargs)
+            if cache_key is not None:
+                self._formatted_cache[cache_key] = formatted
+            return formatted
         except KeyError as e:
-            logger.warning(f"Missing format parameter {e} for text key {key}")
+            logger.warning("Missing format parameter %s for text key %s", e, key)
             return text
         except Exception as e:
-            logger.error(f"Error formatting text for key {key}: {e}")
+            logger.error("Error formatting text for key %s: %s", key, e)
             return text
 
     def get_supported_languages(self) -> list:
@@ -182,7 +255,9 @@ class Localizer:
             self.texts[language] = {}
 
         self.texts[language][key] = text
-        logger.debug(f"Added text for {language}.{key}")
+        self._template_cache.clear()
+        self._formatted_cache.clear()
+        logger.debug("Added text for %s.%s", language, key)
 
     def get_language_from_code(self, language_code: str) -> str:
         """
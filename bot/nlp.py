@@ -4,10 +4,25 @@ Natural Language Processing module for parsing user commands
 
 import re
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
+
+from bot.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Patterns used outside the command tables, compiled once at import
+_HTML_TAG = re.compile(r'<[^>]+>')
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+# Every command pattern contains one of these words; messages without any of
+# them cannot match and skip the pattern scan. Keep in sync with the patterns.
+_TRIGGER_WORDS = ("бот", "bot", "подтвер", "отклон")
+
+# Only short messages have their parse result cached: commands are short and
+# repeated, while long texts are parsed off the event loop (see webhook_bot)
+RESULT_CACHE_MAX_LENGTH = 256
+_NO_MATCH: Dict[str, Any] = {}
+
 
 class NLPProcessor:
     """Processes natural language commands from users"""
@@ -71,14 +86,33 @@ class NLPProcessor:
                 ]
             }
         }
+        
+        # Compiled once per process (see get_processor) and reused for every message
+        self._compiled = {
+            language: {
+                command_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+                for command_type, patterns in lang_patterns.items()
+            }
+            for language, lang_patterns in self.patterns.items()
+        }
+        
+        # (normalized message, language) -> parsed command or _NO_MATCH
+        self._results = TTLCache(maxsize=4096, ttl=3600)
     
-    def parse_message(self, message: str, language: str = "en") -> Optional[Dict[str, Any]]:
+    def parse_message(
+        self,
+        message: str,
+        language: str = "en",
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Parse a message and return the extracted command
         
         Args:
             message: The message text to parse
             language: Language code (en, ru)
+            use_cache: Read and fill the result cache; pass False when calling
+                from a worker thread, since the cache is not thread-safe
             
         Returns:
             Dict with command type and extracted data, or None if no match
@@ -87,39 +121,116 @@ class NLPProcessor:
             return None
         
         # Не удаляем HTML теги полностью, только заменяем на пробелы чтобы не склеивать слова
-        import re
-        message_clean = re.sub(r'<[^>]+>', ' ', message)
+        message_clean = _HTML_TAG.sub(' ', message)
         
         # Normalize message
         message_lower = message_clean.lower().strip()
         
+        # Ordinary chat messages are rejected without running any pattern
+        if not any(word in message_lower for word in _TRIGGER_WORDS):
+            logger.debug("No command trigger in message: %s", message)
+            return None
+        
+        if not use_cache or len(message_lower) > RESULT_CACHE_MAX_LENGTH:
+            return self._scan(message, message_lower, language)
+        
+        # Repeated commands reuse the earlier result; callers get their own copy
+        cache_key = (message_lower, language)
+        result = self._results.get(cache_key)
+        if result is None:
+            result = self._scan(message, message_lower, language) or _NO_MATCH
+            self._results[cache_key] = result
+        return dict(result) if result is not _NO_MATCH else None
+    
+    def _scan(self, message: str, message_lower: str, language: str) -> Optional[Dict[str, Any]]:
+        """
+        Run the command patterns over a normalized message
+        
+        Args:
+            message: Original message text, for logging
+            message_lower: Cleaned, lowercased message text
+            language: Language code (en, ru)
+            
+        Returns:
+            Dict with command type and extracted data, or None if no match
+        """
         # Get patterns for the language (fallback to English)
-        lang_patterns = self.patterns.get(language, self.patterns["en"])
+        lang_patterns = self._compiled.get(language, self._compiled["en"])
         
         # Try each pattern type
         for command_type, patterns in lang_patterns.items():
             result = self._match_patterns(message_lower, patterns, command_type)
             if result:
-                logger.info(f"Parsed command: {command_type} from message: {message}")
+                logger.info("Parsed command: %s from message: %s", command_type, message)
                 return result
         
         # Try fallback language if not English/Russian
         if language not in ["en", "ru"]:
             for lang in ["en", "ru"]:
-                lang_patterns = self.patterns[lang]
+                lang_patterns = self._compiled[lang]
                 for command_type, patterns in lang_patterns.items():
                     result = self._match_patterns(message_lower, patterns, command_type)
                     if result:
-                        logger.info(f"Parsed command (fallback): {command_type} from message: {message}")
+                        logger.info("Parsed command (fallback): %s from message: %s", command_type, message)
                         return result
         
-        logger.debug(f"No command pattern matched for message: {message}")
+        logger.debug("No command pattern matched for message: %s", message)
+        return None
+    
+    def parse_template(
+        self,
+        template: str,
+        language: str = "en"
+    ) -> Optional[Callable[..., Dict[str, Any]]]:
+        """
+        Parse a message template once and return a filler for its placeholder
+        
+        The template holds a single placeholder (e.g. "Bot, my nick {team}") that
+        stands for one word or number. It is parsed with a sample value, and the
+        returned callable builds the command for concrete values without running
+        the regex patterns again.
+        
+        Args:
+            template: Message template with one named placeholder
+            language: Language code (en, ru)
+            
+        Returns:
+            Callable taking the placeholder as a keyword argument, or None if
+            the template does not parse into a command
+        """
+        placeholders = _PLACEHOLDER.findall(template)
+        if len(placeholders) != 1:
+            raise ValueError(f"Template must contain exactly one placeholder: {template}")
+        placeholder = placeholders[0]
+        
+        # Digits are accepted by every capture group, words only by text ones
+        for sample in ("424242", "templatevalue"):
+            command = self.parse_message(template.format(**{placeholder: sample}), language)
+            if not command:
+                continue
+            
+            field = next((key for key, value in command.items() if sample in str(value)), None)
+            if field is None:
+                continue
+            
+            captured = command[field]
+            if isinstance(captured, int):
+                convert = int
+            else:
+                # Captured text is lowercased by parse_message
+                convert = lambda value: captured.replace(sample, str(value).lower())
+            
+            def fill(**values: Any) -> Dict[str, Any]:
+                return {**command, field: convert(values[placeholder])}
+            
+            return fill
+        
         return None
     
     def _match_patterns(
         self, 
         message: str, 
-        patterns: List[str], 
+        patterns: List[re.Pattern], 
         command_type: str
     ) -> Optional[Dict[str, Any]]:
         """
@@ -127,14 +238,14 @@ class NLPProcessor:
         
         Args:
             message: Normalized message text
-            patterns: List of regex patterns to try
+            patterns: List of compiled regex patterns to try
             command_type: Type of command being matched
             
         Returns:
             Dict with parsed command data or None
         """
         for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+            match = pattern.search(message)
             if match:
                 return self._extract_command_data(match, command_type)
         
@@ -240,3 +351,19 @@ class NLPProcessor:
             return len(username) >= 5 and len(username) <= 32
         
         return True
+
+
+_processor: Optional[NLPProcessor] = None
+
+
+def get_processor() -> NLPProcessor:
+    """
+    Get the shared NLPProcessor, creating it on first use
+    
+    Returns:
+        Process-wide NLPProcessor instance
+    """
+    global _processor
+    if _processor is None:
+        _processor = NLPProcessor()
+    return _processor
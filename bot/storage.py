@@ -6,18 +6,70 @@ Handles persistent storage and retrieval of player data
 import json
 import logging
 import os
+import sys
 import asyncio
+import random
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Canonical tournament codes. Strings read back from JSON are remapped onto
+# these so every dict key and comparison shares one interned object.
+TOURNAMENT_TYPES = (sys.intern("vsa"), sys.intern("h2h"))
+_CANONICAL_TOURNAMENT_TYPES = {tournament_type: tournament_type for tournament_type in TOURNAMENT_TYPES}
+
+
+# Display labels for the tournament codes, so replies skip str.upper()
+TOURNAMENT_LABELS = {"vsa": "VSA", "h2h": "H2H"}
+
+
+def canonical_tournament_type(tournament_type: str) -> str:
+    """Return the interned tournament code for a known tournament type"""
+    return _CANONICAL_TOURNAMENT_TYPES.get(tournament_type, tournament_type)
+
+
+def tournament_label(tournament_type: str) -> str:
+    """Return the display label for a tournament type (e.g. "VSA")"""
+    label = TOURNAMENT_LABELS.get(tournament_type)
+    return label if label is not None else tournament_type.upper()
+
+
+# (epoch second, ISO text) of the last timestamp handed out by _now_iso
+_now_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """
+    Current local time as ISO text with one-second resolution
+
+    The text is rebuilt at most once per second, so a burst of registrations
+    and saves shares one datetime conversion.
+    """
+    global _now_cache
+    second = int(time.time())
+    if second != _now_cache[0]:
+        _now_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_cache[1]
+
 
 class DataStorage:
     """Handles data persistence for tournament registrations"""
 
     def __init__(self, data_file: str = "tournament_data.json"):
         self.data_file = data_file
+
+        # Bumped on every change to players or pending registrations (see version)
+        self._version = 0
+
         self.data = self._load_data()
 
         # Initialize structure if needed
@@ -31,32 +83,297 @@ class DataStorage:
                 "last_updated": datetime.now().isoformat()
             }
 
+        # Confirmed players are keyed by lowercase username
+        self.data["players"] = {
+            canonical_tournament_type(tournament_type):
+                self._lowercase_player_keys(tournament_type, tournament_players)
+            for tournament_type, tournament_players in self.data["players"].items()
+        }
+        for reg_data in self.data["temp_registrations"].values():
+            if "tournament_type" in reg_data:
+                reg_data["tournament_type"] = canonical_tournament_type(reg_data["tournament_type"])
+
+        # Lowercase username -> user IDs of pending registrations (see _pending_index)
+        self._pending_by_username: Optional[Dict[str, List[str]]] = None
+        self._pending_index_source: Optional[Dict[str, Any]] = None
+
+        # Encoded players, reused until the next write (see players_json)
+        self._players_json_cache: Optional[bytes] = None
+        self._players_json_source: Optional[Dict[str, Any]] = None
+
+        # Unsaved in-memory writes, drained by flush_async (see start_flusher).
+        # _dirty_seq counts writes, _saved_seq is the newest count known to be
+        # on disk, so a failed save leaves the writes pending for the next one
+        self._dirty_seq = 0
+        self._saved_seq = 0
+        self._flush_threshold = 100
+        self._flush_wakeup: Optional[asyncio.Event] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        # Held around every file write, sync or in flush_async's worker thread
+        self._file_lock = threading.Lock()
+
+        # Background expiry of temp registrations (see start_cleanup)
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _lowercase_player_keys(tournament_type: str, tournament_players: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Re-key a tournament's players by lowercase username
+
+        Files written before keys were lowercased may hold the same username in
+        different cases; the first entry is kept and the others are logged.
+        The original spelling is kept in the record for display.
+        """
+        players: Dict[str, Any] = {}
+        for username, player_data in tournament_players.items():
+            key = username.lower()
+            if key in players:
+                logger.warning(
+                    "Dropping duplicate %s player %s (already loaded as %s): %s",
+                    tournament_type, username, players[key].get("username", key), player_data
+                )
+                continue
+            player_data.setdefault("username", username)
+            players[key] = player_data
+        return players
+
     def _load_data(self) -> Dict[str, Any]:
         """Load data from JSON file"""
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.data_file, 'rb') as f:
+                    raw = f.read()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
             else:
-                logger.info(f"Data file {self.data_file} not found, creating new")
+                logger.info("Data file %s not found, creating new", self.data_file)
                 return {}
         except Exception as e:
-            logger.error(f"Error loading data: {e}")
+            logger.error("Error loading data: %s", e)
             return {}
 
+    def _encode_data(self) -> bytes:
+        """Stamp last_updated and encode the data as indented UTF-8 JSON"""
+        self.data["metadata"]["last_updated"] = _now_iso()
+        if orjson is not None:
+            return orjson.dumps(self.data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.data, indent=2, ensure_ascii=False).encode("utf-8")
+
     def _save_data(self) -> bool:
         """Save data to JSON file"""
+        self._mark_dirty()
         try:
-            self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+            seq, payload = self._snapshot()
+        except Exception as e:
+            logger.error("Error saving data: %s", e)
+            return False
+        return self._write_snapshot(seq, payload)
+
+    def _snapshot(self) -> Tuple[int, bytes]:
+        """Encode the data along with the write count it covers"""
+        seq = self._dirty_seq
+        return seq, self._encode_data()
+
+    def _write_snapshot(self, seq: int, payload: bytes) -> bool:
+        """
+        Write a snapshot and mark the writes it covers as saved
+
+        Every save goes through here. Writes are serialized, and a snapshot
+        older than the one already on disk is dropped instead of replacing it.
+        """
+        with self._file_lock:
+            if seq <= self._saved_seq:
+                return True
+            if not self._write_file(payload):
+                return False
+            self._saved_seq = seq
+            return True
 
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+    def _write_file(self, payload: bytes) -> bool:
+        """Write an already encoded snapshot to the data file"""
+        try:
+            with open(self.data_file, 'wb') as f:
+                f.write(payload)
             return True
         except Exception as e:
-            logger.error(f"Error saving data: {e}")
+            logger.error("Error saving data: %s", e)
             return False
 
-    async def save_temp_registration(
+    @property
+    def _dirty_count(self) -> int:
+        """Number of in-memory writes not saved yet"""
+        return self._dirty_seq - self._saved_seq
+
+    def _mark_dirty(self) -> None:
+        """Record an unsaved write and wake the flusher once enough pile up"""
+        self._dirty_seq += 1
+        if self._flush_wakeup is not None and self._dirty_count >= self._flush_threshold:
+            self._flush_wakeup.set()
+
+    async def flush_async(self) -> bool:
+        """
+        Save pending in-memory writes without blocking the event loop
+
+        The snapshot is encoded on the loop thread so that concurrent writers
+        cannot mutate it mid-dump; only the file write runs in a worker thread.
+        Writes are serialized, and callers that queued up behind a write find
+        their changes already covered by the next one, so a burst of N saves
+        costs about two file writes.
+
+        If the save fails, the writes stay pending and the next flush retries them.
+
+        Returns:
+            True if there was nothing to save or the save succeeded
+        """
+        if not self._dirty_count:
+            return True
+
+        async with self._write_lock:
+            if not self._dirty_count:
+                return True
+            try:
+                seq, payload = self._snapshot()
+            except Exception as e:
+                logger.error("Error saving data: %s", e)
+                return False
+            return await asyncio.to_thread(self._write_snapshot, seq, payload)
+
+    async def _flusher(self, interval: float) -> None:
+        """Background loop that flushes every interval or when the threshold is hit"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            await self.flush_async()
+
+    def start_flusher(self, interval: float = 0.1, threshold: int = 100) -> None:
+        """
+        Start batching saves of save_temp_registration_sync writes
+
+        Args:
+            interval: Seconds between periodic flushes
+            threshold: Flush early once this many writes are pending
+        """
+        if self._flusher_task is not None:
+            return
+        self._flush_threshold = threshold
+        self._flush_wakeup = asyncio.Event()
+        self._flusher_task = asyncio.create_task(self._flusher(interval))
+
+    async def stop_flusher(self) -> bool:
+        """Stop the background flusher and save anything still pending"""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+            self._flush_wakeup = None
+        return await self.flush_async()
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Raw tournament data; assigning it drops the caches built from it and bumps version"""
+        return self._data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._data = value
+        self._pending_by_username = None
+        self._players_json_cache = None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever players or pending registrations change"""
+        return self._version
+
+    def players_json(self) -> bytes:
+        """
+        JSON encoding of the confirmed players with sorted keys
+
+        The encoded bytes are cached until a write path changes the players
+        or the players dict is replaced.
+        """
+        players = self.data.get("players", {})
+        if self._players_json_cache is None or players is not self._players_json_source:
+            if orjson is not None:
+                self._players_json_cache = orjson.dumps(players, option=orjson.OPT_SORT_KEYS)
+            else:
+                self._players_json_cache = json.dumps(
+                    players, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+                ).encode("utf-8")
+            self._players_json_source = players
+        return self._players_json_cache
+
+    def _pending_index(self) -> Dict[str, List[str]]:
+        """
+        Index of pending registrations by lowercase username
+
+        Kept in sync by _add_pending/_pop_pending and rebuilt after data is
+        reassigned (see the data setter) or temp_registrations is replaced.
+        """
+        temp_regs = self.data["temp_registrations"]
+        if self._pending_by_username is None or temp_regs is not self._pending_index_source:
+            index: Dict[str, List[str]] = {}
+            for user_id, reg_data in temp_regs.items():
+                index.setdefault(reg_data.get("username", "").lower(), []).append(user_id)
+            self._pending_by_username = index
+            self._pending_index_source = temp_regs
+        return self._pending_by_username
+
+    @staticmethod
+    def _unindex_pending(index: Dict[str, List[str]], user_id: str, reg_data: Dict[str, Any]) -> None:
+        """Drop a user ID from the pending username index"""
+        key = reg_data.get("username", "").lower()
+        user_ids = index.get(key)
+        if user_ids and user_id in user_ids:
+            user_ids.remove(user_id)
+            if not user_ids:
+                del index[key]
+
+    def _add_pending(self, user_id: str, reg_data: Dict[str, Any]) -> None:
+        """Store a pending registration and index it"""
+        index = self._pending_index()
+        temp_regs = self.data["temp_registrations"]
+        if user_id in temp_regs:
+            self._unindex_pending(index, user_id, temp_regs[user_id])
+        temp_regs[user_id] = reg_data
+        index.setdefault(reg_data["username"].lower(), []).append(user_id)
+        self._version += 1
+
+    def _pop_pending(self, user_id: str) -> Dict[str, Any]:
+        """Remove a pending registration and its index entry"""
+        index = self._pending_index()
+        temp_regs = self.data["temp_registrations"]
+        reg_data = temp_regs.pop(user_id)
+        self._unindex_pending(index, user_id, reg_data)
+        self._version += 1
+        return reg_data
+
+    def find_temp_registrations(self, username: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Find pending registrations by username
+
+        Args:
+            username: Username to look up (case-insensitive, without @)
+
+        Returns:
+            List of (user_id, registration data) pairs, oldest first
+        """
+        temp_regs = self.data["temp_registrations"]
+        clean_username = username.lower()
+        return [
+            (user_id, temp_regs[user_id])
+            for user_id in self._pending_index().get(clean_username, ())
+            if user_id in temp_regs
+            and temp_regs[user_id].get("username", "").lower() == clean_username
+        ]
+
+    def save_temp_registration_sync(
         self,
         user_id: int,
         username: str,
@@ -64,75 +381,213 @@ class DataStorage:
         team_name: str,
         rating: int
     ) -> bool:
-        """Save temporary registration pending admin confirmation"""
+        """
+        Store a temporary registration in memory without saving it
+
+        The write is picked up by the next flush_async (or the background
+        flusher started with start_flusher).
+        """
         try:
+            tournament_type = canonical_tournament_type(tournament_type)
+
             # Check if user already has a confirmed registration for this tournament
             confirmed_players = self.data["players"].get(tournament_type, {})
-            if username.lower() in [k.lower() for k in confirmed_players.keys()]:
-                logger.warning(f"User {username} already registered for {tournament_type}")
+            if username.lower() in confirmed_players:
+                logger.warning("User %s already registered for %s", username, tournament_type)
                 return False
 
             # Check if user already has a pending registration
-            temp_regs = self.data["temp_registrations"]
-            for existing_user_id, existing_data in temp_regs.items():
-                if (existing_data.get("username", "").lower() == username.lower() and 
-                    existing_data.get("tournament_type") == tournament_type):
-                    logger.warning(f"User {username} already has pending registration for {tournament_type}")
+            for _, existing_data in self.find_temp_registrations(username):
+                if existing_data.get("tournament_type") == tournament_type:
+                    logger.warning("User %s already has pending registration for %s", username, tournament_type)
                     return False
 
             # Save temporary registration
-            self.data["temp_registrations"][str(user_id)] = {
+            self._add_pending(str(user_id), {
                 "username": username,
                 "tournament_type": tournament_type,
                 "team_name": team_name,
                 "rating": rating,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _now_iso(),
                 "confirmed": False
-            }
+            })
 
-            self._save_data()
-            logger.info(f"Saved temp registration for {username}: {tournament_type}")
+            self._mark_dirty()
+            logger.info("Saved temp registration for %s: %s", username, tournament_type)
             return True
 
         except Exception as e:
-            logger.error(f"Error saving temp registration: {e}")
+            logger.error("Error saving temp registration: %s", e)
             return False
 
-    def confirm_registration(self, user_id: int) -> bool:
-        """Подтверждение регистрации"""
-        try:
-            temp_registrations = self.data.get("temp_registrations", {})
+    async def save_temp_registration(
+        self,
+        user_id: int,
+        username: str,
+        tournament_type: str,
+        team_name: str,
+        rating: int
+    ) -> bool:
+        """Save temporary registration pending admin confirmation"""
+        if not self.save_temp_registration_sync(user_id, username, tournament_type, team_name, rating):
+            return False
 
-            if str(user_id) not in temp_registrations:
-                return False
+        # Without a background flusher, persist now (off the event loop)
+        if self._flusher_task is None:
+            await self.flush_async()
+        return True
+
+    async def add_temp_registrations(self, registrations: Mapping[str, Dict[str, Any]]) -> int:
+        """
+        Store already built temporary registrations as is
+
+        Unlike save_temp_registration, nothing is checked or stamped, so
+        imported or test entries keep their own timestamps.
+
+        Args:
+            registrations: Registration data keyed by user ID
+
+        Returns:
+            Number of stored registrations
+        """
+        for user_id, reg_data in registrations.items():
+            self._add_pending(str(user_id), dict(reg_data))
+
+        if registrations:
+            self._mark_dirty()
+            if self._flusher_task is None:
+                await self.flush_async()
+        return len(registrations)
+
+    async def remove_temp_registrations(self, user_ids: Iterable[str]) -> int:
+        """
+        Remove temporary registrations and save once
+
+        Args:
+            user_ids: IDs of the registrations to remove; unknown IDs are skipped
+
+        Returns:
+            Number of removed registrations
+        """
+        temp_regs = self.data["temp_registrations"]
+        removed = 0
+        for user_id in user_ids:
+            if str(user_id) in temp_regs:
+                self._pop_pending(str(user_id))
+                removed += 1
+
+        if removed:
+            self._mark_dirty()
+            if self._flusher_task is None:
+                await self.flush_async()
+        return removed
+
+    def _confirm_in_memory(self, user_id: int) -> bool:
+        """Перенос временной регистрации в подтвержденные игроки (без сохранения)"""
+        temp_registrations = self.data.get("temp_registrations", {})
+
+        if str(user_id) not in temp_registrations:
+            return False
 
-            user_data = temp_registrations[str(user_id)]
-            tournament_type = user_data["tournament_type"]
+        user_data = temp_registrations[str(user_id)]
+        tournament_type = user_data["tournament_type"]
+
+        # Перемещаем в основные игроки
+        if tournament_type not in self.data["players"]:
+            self.data["players"][tournament_type] = {}
+
+        self._players_json_cache = None
+        self.data["players"][tournament_type][user_data["username"].lower()] = {
+            "username": user_data["username"],
+            "name": user_data["team_name"],
+            "stars": user_data["rating"],
+            "confirmed": True,
+            "user_id": user_id,
+            "registered_at": _now_iso()
+        }
 
-            # Перемещаем в основные игроки
-            if tournament_type not in self.data["players"]:
-                self.data["players"][tournament_type] = {}
+        # Удаляем из временных
+        self._pop_pending(str(user_id))
 
-            self.data["players"][tournament_type][user_data["username"]] = {
-                "name": user_data["team_name"],
-                "stars": user_data["rating"],
-                "confirmed": True,
-                "user_id": user_id,
-                "registered_at": datetime.now().isoformat()
-            }
+        return True
+
+    def confirm_registration(self, user_id: int) -> bool:
+        """Подтверждение регистрации"""
+        try:
+            if not self._confirm_in_memory(user_id):
+                return False
 
-            # Удаляем из временных
-            del self.data["temp_registrations"][str(user_id)]
-            
             # Сохраняем данные
             self._save_data()
 
             return True
 
         except Exception as e:
-            logger.error(f"Ошибка подтверждения регистрации: {e}")
+            logger.error("Ошибка подтверждения регистрации: %s", e)
             return False
 
+    async def confirm_registration_async(self, user_id: int) -> bool:
+        """
+        Confirm a registration without blocking the event loop
+
+        The move happens in memory on the loop thread; the save goes through
+        flush_async (or is left to the background flusher).
+
+        Args:
+            user_id: ID of the temporary registration to confirm
+
+        Returns:
+            True if the registration was confirmed
+        """
+        try:
+            if not self._confirm_in_memory(user_id):
+                return False
+        except Exception as e:
+            logger.error("Ошибка подтверждения регистрации: %s", e)
+            return False
+
+        self._mark_dirty()
+        if self._flusher_task is None:
+            await self.flush_async()
+        return True
+
+    def confirm_registrations_bulk(
+        self,
+        user_ids: Iterable[int],
+        flush_every: Optional[int] = None
+    ) -> int:
+        """
+        Confirm several registrations with a single save
+
+        Args:
+            user_ids: IDs of the temporary registrations to confirm
+            flush_every: Also save after every N confirmations (default: only at the end)
+
+        Returns:
+            Number of confirmed registrations
+        """
+        confirmed = 0
+        pending_flush = 0
+
+        try:
+            for user_id in user_ids:
+                if not self._confirm_in_memory(user_id):
+                    continue
+                confirmed += 1
+                pending_flush += 1
+
+                if flush_every and pending_flush >= flush_every:
+                    self._save_data()
+                    pending_flush = 0
+
+        except Exception as e:
+            logger.error("Error confirming registrations: %s", e)
+
+        if pending_flush:
+            self._save_data()
+
+        return confirmed
+
     def reject_registration(self, user_id: int) -> bool:
         """Отклонение регистрации"""
         try:
@@ -140,7 +595,7 @@ class DataStorage:
                 return False
 
             # Просто удаляем из временных регистраций
-            del self.data["temp_registrations"][str(user_id)]
+            self._pop_pending(str(user_id))
             
             # Сохраняем данные
             self._save_data()
@@ -148,16 +603,20 @@ class DataStorage:
             return True
 
         except Exception as e:
-            logger.error(f"Ошибка отклонения регистрации: {e}")
+            logger.error("Ошибка отклонения регистрации: %s", e)
             return False
 
-    def get_all_players(self) -> Dict[str, Dict[str, Any]]:
-        """Get all confirmed players"""
-        return self.data.get("players", {"vsa": {}, "h2h": {}})
+    def get_all_players(self) -> Mapping[str, Dict[str, Any]]:
+        """Get a read-only view of all confirmed players"""
+        return MappingProxyType(self.data.get("players", {"vsa": {}, "h2h": {}}))
 
-    def get_temp_registrations(self) -> Dict[str, Any]:
-        """Get all temporary registrations"""
-        return self.data.get("temp_registrations", {})
+    def get_temp_registrations(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of all temporary registrations
+
+        The view is live and not copied; use the storage methods to change it.
+        """
+        return MappingProxyType(self.data.get("temp_registrations", {}))
 
     def remove_confirmed_player(self, tournament_type: str, username: str) -> bool:
         """Удаление подтвержденного игрока"""
@@ -167,14 +626,16 @@ class DataStorage:
             
             if username in tournament_players:
                 del tournament_players[username]
+                self._players_json_cache = None
+                self._version += 1
                 self._save_data()
-                logger.info(f"Удален игрок {username} из турнира {tournament_type}")
+                logger.info("Удален игрок %s из турнира %s", username, tournament_type)
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"Ошибка удаления игрока: {e}")
+            logger.error("Ошибка удаления игрока: %s", e)
             return False
 
     def get_statistics(self) -> Dict[str, Any]:
@@ -182,27 +643,29 @@ class DataStorage:
         players = self.data.get("players", {})
         temp_regs = self.data.get("temp_registrations", {})
 
-        vsa_total = len(players.get("vsa", {}))
-        h2h_total = len(players.get("h2h", {}))
-
-        vsa_confirmed = sum(1 for p in players.get("vsa", {}).values() if p.get("confirmed"))
-        h2h_confirmed = sum(1 for p in players.get("h2h", {}).values() if p.get("confirmed"))
-
-        # Get last registration time
-        last_time = None
+        # Single pass over every player: confirmed counts and latest timestamp
+        confirmed_counts = {}
         all_times = []
 
-        for tournament_data in players.values():
+        for tournament_type, tournament_data in players.items():
+            confirmed = 0
             for player_data in tournament_data.values():
+                if player_data.get("confirmed"):
+                    confirmed += 1
                 if "registered_at" in player_data:
                     all_times.append(player_data["registered_at"])
+            confirmed_counts[tournament_type] = confirmed
 
         for temp_data in temp_regs.values():
             if "timestamp" in temp_data:
                 all_times.append(temp_data["timestamp"])
 
-        if all_times:
-            last_time = max(all_times)
+        last_time = max(all_times) if all_times else None
+
+        vsa_total = len(players.get("vsa", {}))
+        h2h_total = len(players.get("h2h", {}))
+        vsa_confirmed = confirmed_counts.get("vsa", 0)
+        h2h_confirmed = confirmed_counts.get("h2h", 0)
 
         return {
             "vsa_total": vsa_total,
@@ -214,53 +677,101 @@ class DataStorage:
             "last_registration_time": last_time
         }
 
+    def _clear_in_memory(self) -> None:
+        """Reset players and pending registrations (without saving)"""
+        self.data = {
+            "players": {"vsa": {}, "h2h": {}},
+            "temp_registrations": {},
+            "metadata": {
+                "created_at": datetime.now().isoformat(),
+                "last_updated": datetime.now().isoformat(),
+                "cleared_at": datetime.now().isoformat()
+            }
+        }
+
     def clear_all_data(self) -> bool:
         """Clear all tournament data"""
         try:
-            self.data = {
-                "players": {"vsa": {}, "h2h": {}},
-                "temp_registrations": {},
-                "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat(),
-                    "cleared_at": datetime.now().isoformat()
-                }
-            }
+            self._clear_in_memory()
             self._save_data()
             logger.info("All tournament data cleared")
             return True
         except Exception as e:
-            logger.error(f"Error clearing data: {e}")
+            logger.error("Error clearing data: %s", e)
+            return False
+
+    async def clear_all_data_async(self) -> bool:
+        """Clear all tournament data, saving without blocking the event loop"""
+        try:
+            self._clear_in_memory()
+        except Exception as e:
+            logger.error("Error clearing data: %s", e)
             return False
 
+        self._mark_dirty()
+        if self._flusher_task is None:
+            await self.flush_async()
+        logger.info("All tournament data cleared")
+        return True
+
     async def cleanup_expired_registrations(self) -> None:
         """Clean up expired temporary registrations"""
         try:
-            current_time = datetime.now()
+            # Timestamps are naive local ISO strings (see _now_iso), which sort
+            # like the times they encode, so no per-entry datetime parsing
+            cutoff = (datetime.now() - timedelta(hours=24)).isoformat()  # 24 hour expiry
             temp_regs = self.data["temp_registrations"]
-            expired_users = []
-
-            for user_id, reg_data in temp_regs.items():
-                reg_time = datetime.fromisoformat(reg_data["timestamp"])
-                if current_time - reg_time > timedelta(hours=24):  # 24 hour expiry
-                    expired_users.append(user_id)
+            expired_users = [
+                user_id for user_id, reg_data in temp_regs.items()
+                if reg_data["timestamp"] < cutoff
+            ]
 
             for user_id in expired_users:
-                del temp_regs[user_id]
-                logger.info(f"Cleaned up expired registration for user {user_id}")
+                self._pop_pending(user_id)
+                logger.info("Cleaned up expired registration for user %s", user_id)
 
             if expired_users:
-                self._save_data()
+                # Save off the event loop (or leave it to the running flusher)
+                self._mark_dirty()
+                if self._flusher_task is None:
+                    await self.flush_async()
 
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
+
+    async def periodic_cleanup(self, interval: float = 3600, jitter: float = 0.1) -> None:
+        """
+        Run periodic cleanup of expired data
 
-    async def periodic_cleanup(self) -> None:
-        """Run periodic cleanup of expired data"""
+        Args:
+            interval: Seconds between cleanup passes
+            jitter: Random fraction of the interval added to each sleep, so
+                several processes sharing a host do not wake up together
+        """
         while True:
             try:
                 await self.cleanup_expired_registrations()
-                await asyncio.sleep(3600)  # Run every hour
             except Exception as e:
-                logger.error(f"Error in periodic cleanup: {e}")
-                await asyncio.sleep(3600)
\ No newline at end of file
+                logger.error("Error in periodic cleanup: %s", e)
+            await asyncio.sleep(interval * (1 + random.uniform(0, jitter)))
+
+    def start_cleanup(self, interval: float = 3600) -> None:
+        """
+        Start expiring temp registrations in the background
+
+        Args:
+            interval: Seconds between cleanup passes
+        """
+        if self._cleanup_task is not None:
+            return
+        self._cleanup_task = asyncio.create_task(self.periodic_cleanup(interval))
+
+    async def stop_cleanup(self) -> None:
+        """Cancel the background cleanup and wait for it to finish"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Outbound rate limiting for Telegram API calls
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that makes coroutines wait for a free slot
+
+    Waiters are served in arrival order. The bucket can also be paused,
+    e.g. when Telegram answers 429 with a retry_after.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Args:
+            capacity: Maximum burst size in tokens
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.refill_rate)
+
+    def pause(self, seconds: float) -> None:
+        """Drop all tokens and refuse new ones for the given number of seconds"""
+        now = time.monotonic()
+        self._tokens = 0
+        self._updated_at = now
+        self._paused_until = max(self._paused_until, now + seconds)
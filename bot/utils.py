@@ -5,11 +5,14 @@ Utility functions for the tournament bot
 import asyncio
 import logging
 import functools
-from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from bot.storage import tournament_label
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,7 +49,7 @@ def rate_limit(calls_per_minute: int = 30):
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
             user_id = update.effective_user.id if update.effective_user else 0
-            current_time = datetime.now()
+            current_time = time.monotonic()
             
             # Initialize user tracking
             if user_id not in user_calls:
@@ -55,12 +58,12 @@ def rate_limit(calls_per_minute: int = 30):
             # Clean old calls (older than 1 minute)
             user_calls[user_id] = [
                 call_time for call_time in user_calls[user_id]
-                if (current_time - call_time).seconds < 60
+                if current_time - call_time < 60
             ]
             
             # Check rate limit
             if len(user_calls[user_id]) >= calls_per_minute:
-                logger.warning(f"Rate limit exceeded for user {user_id}")
+                logger.warning("Rate limit exceeded for user %s", user_id)
                 await update.message.reply_text("⚠️ Too many requests. Please wait a moment.")
                 return
             
@@ -107,7 +110,7 @@ async def send_safe_message(
         return True
         
     except Exception as e:
-        logger.error(f"Error sending message: {e}")
+        logger.error("Error sending message: %s", e)
         try:
             # Fallback without formatting
             await update.message.reply_text("❌ Error sending formatted message.")
@@ -116,6 +119,47 @@ async def send_safe_message(
         return False
 
 
+def split_message(text: str, max_length: int = 4000) -> List[str]:
+    """
+    Split a long message into Telegram-sized parts on line boundaries
+    
+    Lines are kept whole so HTML tags opened on a line stay in one part;
+    only a single line longer than max_length is cut.
+    
+    Args:
+        text: Message text
+        max_length: Maximum length of each part
+        
+    Returns:
+        Message parts in order (the text itself if it already fits)
+    """
+    if len(text) <= max_length:
+        return [text]
+    
+    parts = []
+    current = []
+    current_length = 0
+    for line in text.split("\n"):
+        while len(line) > max_length:
+            if current:
+                parts.append("\n".join(current))
+                current, current_length = [], 0
+            parts.append(line[:max_length])
+            line = line[max_length:]
+        
+        # +1 for the newline that joins it to the previous line
+        added = len(line) + (1 if current else 0)
+        if current and current_length + added > max_length:
+            parts.append("\n".join(current))
+            current, current_length, added = [], 0, len(line)
+        current.append(line)
+        current_length += added
+    
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
 def extract_username(text: str) -> Optional[str]:
     """
     Extract username from text (with or without @)
@@ -158,7 +202,7 @@ def format_player_list(players: Dict[str, Dict[str, Any]], tournament_type: str)
     if not players:
         return f"No players registered for {tournament_type} tournament."
     
-    lines = [f"🏆 <b>{tournament_type.upper()} Tournament Players:</b>", ""]
+    lines = [f"🏆 <b>{tournament_label(tournament_type)} Tournament Players:</b>", ""]
     
     # Sort by rating (descending)
     sorted_players = sorted(
@@ -190,11 +234,11 @@ def log_user_action(action: str):
             user = update.effective_user
             user_info = f"{user.username} ({user.id})" if user else "Unknown"
             
-            logger.info(f"User {user_info} performed action: {action}")
+            logger.info("User %s performed action: %s", user_info, action)
             
             result = await func(update, context, *args, **kwargs)
             
-            logger.debug(f"Action {action} completed for user {user_info}")
+            logger.debug("Action %s completed for user %s", action, user_info)
             return result
         
         return wrapper
@@ -213,27 +257,26 @@ async def cleanup_old_data(storage, hours: int = 24) -> int:
         Number of entries cleaned up
     """
     try:
-        current_time = datetime.now()
+        cutoff = datetime.now() - timedelta(hours=hours)
         temp_registrations = storage.get_temp_registrations()
-        cleaned_count = 0
+        expired_users = []
         
-        for user_id, data in list(temp_registrations.items()):
+        # Collect first, then delete in one pass
+        for user_id, data in temp_registrations.items():
             try:
-                registration_time = datetime.fromisoformat(data["timestamp"])
-                if (current_time - registration_time).total_seconds() > hours * 3600:
-                    del storage.temp_registrations[user_id]
-                    cleaned_count += 1
-                    logger.info(f"Cleaned up expired registration for user {user_id}")
+                if datetime.fromisoformat(data["timestamp"]) < cutoff:
+                    expired_users.append(user_id)
             except Exception as e:
-                logger.error(f"Error processing registration for user {user_id}: {e}")
+                logger.error("Error processing registration for user %s: %s", user_id, e)
         
-        if cleaned_count > 0:
-            storage._save_data()
+        removed = await storage.remove_temp_registrations(expired_users)
+        for user_id in expired_users:
+            logger.info("Cleaned up expired registration for user %s", user_id)
         
-        return cleaned_count
+        return removed
         
     except Exception as e:
-        logger.error(f"Error during cleanup: {e}")
+        logger.error("Error during cleanup: %s", e)
         return 0
 
 
@@ -306,5 +349,30 @@ async def retry_async(func: Callable, max_retries: int = 3, delay: float = 1.0):
                 raise e
             
             wait_time = delay * (2 ** attempt)
-            logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time}s: {e}")
+            logger.warning("Attempt %s failed, retrying in %ss: %s", attempt + 1, wait_time, e)
             await asyncio.sleep(wait_time)
+
+
+def run(main: Callable[[], Awaitable[Any]], use_uvloop: bool = True) -> Any:
+    """
+    Run an async entry point, on uvloop when it is installed
+    
+    The loop is picked through asyncio.Runner's loop_factory instead of the
+    deprecated uvloop.install(), so the global event loop policy is left alone.
+    
+    Args:
+        main: Coroutine function to run
+        use_uvloop: Set to False to keep the default loop (e.g. under nest_asyncio)
+        
+    Returns:
+        Result of main()
+    """
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                return runner.run(main())
+    return asyncio.run(main())
@@ -4,79 +4,134 @@ Input validation module for tournament registrations
 
 import re
 import logging
-from typing import Any
+from typing import Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Patterns and word lists are compiled once at import time
+TEAM_NAME_PATTERN = re.compile(r'[a-zA-Z0-9а-яА-Я\s\-_\.\[\]]+')
+USERNAME_PATTERN = re.compile(r'[a-zA-Z0-9_]+')
+FORBIDDEN_TEAM_NAMES = frozenset({'admin', 'bot', 'moderator', 'null', 'undefined'})
+VALID_TOURNAMENT_TYPES = ('vsa', 'h2h')
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
 
 
-def validate_team_name(team_name: str) -> None:
-    """
-    Validate team name input
-    
-    Args:
-        team_name: Team name to validate
-        
-    Raises:
-        ValidationError: If validation fails
-    """
+def _team_name_error(team_name: str) -> Optional[str]:
+    """Return the reason a team name is invalid, or None if it is valid"""
     if not team_name:
-        raise ValidationError("Team name cannot be empty")
+        return "Team name cannot be empty"
     
     # Strip whitespace
     team_name = team_name.strip()
     
     # Check length
     if len(team_name) < 2:
-        raise ValidationError("Team name must be at least 2 characters long")
+        return "Team name must be at least 2 characters long"
     
     if len(team_name) > 50:
-        raise ValidationError("Team name cannot exceed 50 characters")
+        return "Team name cannot exceed 50 characters"
     
     # Check for valid characters (allow letters, numbers, spaces, and common symbols)
-    if not re.match(r'^[a-zA-Z0-9а-яА-Я\s\-_\.\[\]]+$', team_name):
-        raise ValidationError("Team name contains invalid characters")
+    if not TEAM_NAME_PATTERN.fullmatch(team_name):
+        return "Team name contains invalid characters"
     
     # Check for excessive spaces
     if '  ' in team_name:
-        raise ValidationError("Team name cannot contain multiple consecutive spaces")
+        return "Team name cannot contain multiple consecutive spaces"
     
     # Check for reserved words or inappropriate content
-    forbidden_words = ['admin', 'bot', 'moderator', 'null', 'undefined']
-    if team_name.lower() in forbidden_words:
-        raise ValidationError("Team name contains forbidden words")
+    if team_name.lower() in FORBIDDEN_TEAM_NAMES:
+        return "Team name contains forbidden words"
     
-    logger.debug(f"Team name '{team_name}' passed validation")
+    return None
 
 
-def validate_rating(rating: Any) -> None:
+def validate_team_name(team_name: str) -> None:
     """
-    Validate rating input
+    Validate team name input
     
     Args:
-        rating: Rating to validate
+        team_name: Team name to validate
         
     Raises:
         ValidationError: If validation fails
     """
-    # Check if it's a number
-    try:
+    error = _team_name_error(team_name)
+    if error:
+        raise ValidationError(error)
+    
+    logger.debug("Team name '%s' passed validation", team_name)
+
+
+def validate_team_name_result(team_name: str) -> Tuple[bool, str]:
+    """
+    Validate team name input without raising
+    
+    Args:
+        team_name: Team name to validate
+        
+    Returns:
+        Tuple of (is_valid, reason); reason is empty for valid names
+    """
+    error = _team_name_error(team_name)
+    return error is None, error or ""
+
+
+def _rating_error(rating: Any) -> Optional[str]:
+    """Return the reason a rating is invalid, or None if it is valid"""
+    # Short plain digit strings skip the exception path entirely
+    if isinstance(rating, str) and len(rating) <= 18 and rating.isascii() and rating.isdigit():
         rating_int = int(rating)
-    except (ValueError, TypeError):
-        raise ValidationError("Rating must be a valid number")
+    else:
+        # Check if it's a number
+        try:
+            rating_int = int(rating)
+        except (ValueError, TypeError, OverflowError):
+            return "Rating must be a valid number"
     
     # Check range
     if rating_int < 0:
-        raise ValidationError("Rating cannot be negative")
+        return "Rating cannot be negative"
     
     if rating_int > 100:
-        raise ValidationError("Rating cannot exceed 100")
+        return "Rating cannot exceed 100"
+    
+    return None
+
+
+def validate_rating(rating: Any) -> None:
+    """
+    Validate rating input
+    
+    Args:
+        rating: Rating to validate
+        
+    Raises:
+        ValidationError: If validation fails
+    """
+    error = _rating_error(rating)
+    if error:
+        raise ValidationError(error)
     
-    logger.debug(f"Rating {rating_int} passed validation")
+    logger.debug("Rating %s passed validation", rating)
+
+
+def validate_rating_result(rating: Any) -> Tuple[bool, str]:
+    """
+    Validate rating input without raising
+    
+    Args:
+        rating: Rating to validate
+        
+    Returns:
+        Tuple of (is_valid, reason); reason is empty for valid ratings
+    """
+    error = _rating_error(rating)
+    return error is None, error or ""
 
 
 def validate_username(username: str) -> None:
@@ -103,14 +158,14 @@ def validate_username(username: str) -> None:
         raise ValidationError("Username cannot exceed 32 characters")
     
     # Check format (Telegram username rules)
-    if not re.match(r'^[a-zA-Z0-9_]+$', clean_username):
+    if not USERNAME_PATTERN.fullmatch(clean_username):
         raise ValidationError("Username can only contain letters, numbers, and underscores")
     
     # Must start with a letter
     if not clean_username[0].isalpha():
         raise ValidationError("Username must start with a letter")
     
-    logger.debug(f"Username '{clean_username}' passed validation")
+    logger.debug("Username '%s' passed validation", clean_username)
 
 
 def validate_tournament_type(tournament_type: str) -> None:
@@ -123,15 +178,13 @@ def validate_tournament_type(tournament_type: str) -> None:
     Raises:
         ValidationError: If validation fails
     """
-    valid_types = ['vsa', 'h2h']
-    
     if not tournament_type:
         raise ValidationError("Tournament type cannot be empty")
     
-    if tournament_type.lower() not in valid_types:
-        raise ValidationError(f"Tournament type must be one of: {', '.join(valid_types)}")
+    if tournament_type.lower() not in VALID_TOURNAMENT_TYPES:
+        raise ValidationError(f"Tournament type must be one of: {', '.join(VALID_TOURNAMENT_TYPES)}")
     
-    logger.debug(f"Tournament type '{tournament_type}' passed validation")
+    logger.debug("Tournament type '%s' passed validation", tournament_type)
 
 
 def sanitize_input(text: str) -> str:
@@ -178,4 +231,4 @@ def validate_command_args(args: list, min_args: int = 0, max_args: int = None) -
     if max_args is not None and len(args) > max_args:
         raise ValidationError(f"Command accepts at most {max_args} arguments")
     
-    logger.debug(f"Command args validation passed: {len(args)} args")
+    logger.debug("Command args validation passed: %d args", len(args))
@@ -0,0 +1,51 @@
+"""
+Helpers shared by the production demos
+Requires Python 3.11+ (asyncio.TaskGroup)
+"""
+
+import asyncio
+import sys
+from typing import Awaitable, Iterable, List, TypeVar
+
+from bot.storage import DataStorage
+
+T = TypeVar("T")
+
+
+def enable_eager_tasks() -> None:
+    """Start short-lived tasks eagerly on Python 3.12+ (no-op on 3.11)"""
+    if sys.version_info >= (3, 12):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+
+async def run_bounded(storage: DataStorage, jobs: Iterable[Awaitable[T]], limit: int = 16) -> List[T]:
+    """
+    Run registration jobs concurrently with batched saves
+
+    At most `limit` jobs run at once, and the storage flusher batches their
+    writes until every job has finished.
+
+    Args:
+        storage: Storage the jobs write to
+        jobs: Awaitables to run
+        limit: Maximum number of jobs running at once
+
+    Returns:
+        Job results in the order the jobs finished
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(job: Awaitable[T]) -> T:
+        async with semaphore:
+            return await job
+
+    results = []
+    storage.start_flusher()
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(bounded(job)) for job in jobs]
+            for next_result in asyncio.as_completed(tasks):
+                results.append(await next_result)
+    finally:
+        await storage.stop_flusher()
+    return results
@@ -3,12 +3,12 @@
 Финальная рабочая версия турнирного бота
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import os
-import json
-from datetime import datetime
-from typing import Dict, Any
+from typing import TYPE_CHECKING
 
 # Настройка логирования
 logging.basicConfig(
@@ -18,18 +18,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 try:
-    from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+    from telegram.ext import Application, CommandHandler, MessageHandler, filters
     from telegram import Update
-    TELEGRAM_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"Ошибка импорта Telegram: {e}")
-    TELEGRAM_AVAILABLE = False
+    logger.error("Ошибка импорта Telegram: %s", e)
     exit(1)
 
+if TYPE_CHECKING:
+    from telegram.ext import ContextTypes
+
 from dotenv import load_dotenv
-from bot.nlp import NLPProcessor
-from bot.storage import DataStorage
+from bot.nlp import get_processor
+from bot.storage import DataStorage, TOURNAMENT_TYPES, tournament_label
 from bot.localization import Localizer
+from bot.utils import run
 from bot.validation import ValidationError, validate_team_name, validate_rating
 
 # Загрузка переменных окружения
@@ -43,7 +45,7 @@ class TournamentBot:
         if not self.token:
             raise ValueError("BOT_TOKEN не найден в переменных окружения")
 
-        self.admins = [admin.strip().lower() for admin in os.getenv('ADMINS', '').split(',') if admin.strip()]
+        self.admins = frozenset(admin.strip().lower() for admin in os.getenv('ADMINS', '').split(',') if admin.strip())
         
         # ID владельца бота (ваш Telegram ID)
         self.owner_id = int(os.getenv('OWNER_ID', '0'))
@@ -53,12 +55,12 @@ class TournamentBot:
         # Инициализация компонентов
         self.storage = DataStorage()
         self.localizer = Localizer()
-        self.nlp = NLPProcessor()
+        self.nlp = get_processor()
         
         # Очищаем старые данные при запуске
         self._clear_old_data()
 
-        logger.info(f"Турнирный бот инициализирован для владельца {self.owner_id}")
+        logger.info("Турнирный бот инициализирован для владельца %s", self.owner_id)
     
     def _clear_old_data(self):
         """Очистка старых данных"""
@@ -75,7 +77,7 @@ class TournamentBot:
             self.storage.save_data()
             logger.info("Хранилище данных очищено")
         except Exception as e:
-            logger.error(f"Ошибка очистки данных: {e}")
+            logger.error("Ошибка очистки данных: %s", e)
 
     async def is_owner_in_chat(self, update, context) -> bool:
         """Проверка присутствия владельца в чате"""
@@ -83,26 +85,26 @@ class TournamentBot:
             chat = update.effective_chat
             user = update.effective_user
             
-            logger.info(f"Проверка владельца: chat_id={chat.id}, user_id={user.id}, owner_id={self.owner_id}")
+            logger.info("Проверка владельца: chat_id=%s, user_id=%s, owner_id=%s", chat.id, user.id, self.owner_id)
             
             # Для личных сообщений разрешаем работу только владельцу
             if chat.type == 'private':
                 is_owner = user.id == self.owner_id
-                logger.info(f"Личное сообщение: is_owner={is_owner}")
+                logger.info("Личное сообщение: is_owner=%s", is_owner)
                 return is_owner
             
             # Для групповых чатов проверяем присутствие владельца
             try:
                 owner_member = await context.bot.get_chat_member(chat.id, self.owner_id)
                 is_owner_in_group = owner_member.status in ['member', 'administrator', 'creator']
-                logger.info(f"Групповой чат: owner_status={owner_member.status}, is_owner_in_group={is_owner_in_group}")
+                logger.info("Групповой чат: owner_status=%s, is_owner_in_group=%s", owner_member.status, is_owner_in_group)
                 return is_owner_in_group
             except Exception as e:
-                logger.error(f"Владелец не найден в чате {chat.id}: {e}")
+                logger.error("Владелец не найден в чате %s: %s", chat.id, e)
                 return False
                 
         except Exception as e:
-            logger.error(f"Ошибка проверки владельца: {e}")
+            logger.error("Ошибка проверки владельца: %s", e)
             return False
 
     async def is_admin(self, update, context) -> bool:
@@ -114,7 +116,7 @@ class TournamentBot:
             member = await context.bot.get_chat_member(chat.id, user.id)
             return member.status in ['administrator', 'creator']
         except Exception as e:
-            logger.error(f"Ошибка проверки прав: {e}")
+            logger.error("Ошибка проверки прав: %s", e)
             return False
 
     async def handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -151,7 +153,7 @@ class TournamentBot:
     async def handle_roster(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Команда /roster"""
         if not await self.is_owner_in_chat(update, context):
-            logger.info(f"Игнорируем команду /roster от {update.effective_user.id} в чате {update.effective_chat.id} - владелец не найден")
+            logger.info("Игнорируем команду /roster от %s в чате %s - владелец не найден", update.effective_user.id, update.effective_chat.id)
             return
             
         if not await self.is_admin(update, context):
@@ -163,31 +165,24 @@ class TournamentBot:
 
         message_parts = []
 
-        # VSA Турнир
-        vsa_players = players.get("vsa", {})
-        if vsa_players:
-            message_parts.append("🏆 VSA Турнир:")
-            for username, data in vsa_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username}: {data['name']} ({data['stars']} ⭐)")
-
-        # H2H Турнир
-        h2h_players = players.get("h2h", {})
-        if h2h_players:
-            message_parts.append("⚔️ H2H Турнир:")
-            for username, data in h2h_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username}: {data['name']} ({data['stars']} ⭐)")
+        # Турниры: заголовок и строки игроков одним проходом
+        for header, tournament_type in (("🏆 VSA Турнир:", "vsa"), ("⚔️ H2H Турнир:", "h2h")):
+            tournament_players = players.get(tournament_type, {})
+            if tournament_players:
+                message_parts.append(header)
+                message_parts.extend(
+                    f"{'✅' if data.get('confirmed') else '⏳'} {data.get('username', username)}: {data['name']} ({data['stars']} ⭐)"
+                    for username, data in tournament_players.items()
+                )
 
         # Ожидающие подтверждения
         if temp_registrations:
             message_parts.append("\n⏳ Ожидают подтверждения:")
-            for user_id, data in temp_registrations.items():
-                username = data.get("username", "Unknown")
-                tournament = data.get("tournament_type", "unknown").upper()
-                team_name = data.get("team_name", "Unknown")
-                rating = data.get("rating", 0)
-                message_parts.append(f"• @{username} - {tournament}: {team_name} ({rating} ⭐)")
+            message_parts.extend(
+                f"• @{data.get('username', 'Unknown')} - {tournament_label(data.get('tournament_type', 'unknown'))}: "
+                f"{data.get('team_name', 'Unknown')} ({data.get('rating', 0)} ⭐)"
+                for data in temp_registrations.values()
+            )
 
         final_message = "\n".join(message_parts) if message_parts else "Регистраций нет"
         await update.message.reply_text(final_message)
@@ -195,7 +190,7 @@ class TournamentBot:
     async def handle_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Команда /stats"""
         if not await self.is_owner_in_chat(update, context):
-            logger.info(f"Игнорируем команду /stats от {update.effective_user.id} в чате {update.effective_chat.id} - владелец не найден")
+            logger.info("Игнорируем команду /stats от %s в чате %s - владелец не найден", update.effective_user.id, update.effective_chat.id)
             return
             
         if not await self.is_admin(update, context):
@@ -221,7 +216,7 @@ class TournamentBot:
         user = update.effective_user
         message_text = update.message.text
 
-        logger.info(f"Сообщение от {user.username or user.first_name}: {message_text}")
+        logger.info("Сообщение от %s: %s", user.username or user.first_name, message_text)
 
         try:
             parsed_command = self.nlp.parse_message(message_text, "ru")
@@ -249,7 +244,7 @@ class TournamentBot:
                 await self.handle_admin_reject(update, context, parsed_command["username"])
 
         except Exception as e:
-            logger.error(f"Ошибка обработки: {e}")
+            logger.error("Ошибка обработки: %s", e)
             await update.message.reply_text("❌ Произошла ошибка при обработке команды")
 
     async def handle_team_name(self, update: Update, context: ContextTypes.DEFAULT_TYPE, team_name: str):
@@ -285,7 +280,8 @@ class TournamentBot:
             team_name = registration_data["team_name"]
             user = update.effective_user
 
-            success = await self.storage.save_temp_registration(
+            # Регистрация сохраняется в памяти, запись файла идёт параллельно с ответом
+            success = self.storage.save_temp_registration_sync(
                 user_id=user.id,
                 username=user.username or user.first_name,
                 tournament_type=tournament_type,
@@ -294,9 +290,12 @@ class TournamentBot:
             )
 
             if success:
-                await update.message.reply_text(
-                    f"✅ Рейтинг {tournament_type.upper()} сохранен: {rating} ⭐\n\n"
-                    f"⏳ Ожидайте подтверждения от администратора"
+                await asyncio.gather(
+                    update.message.reply_text(
+                        f"✅ Рейтинг {tournament_label(tournament_type)} сохранен: {rating} ⭐\n\n"
+                        f"⏳ Ожидайте подтверждения от администратора"
+                    ),
+                    self.storage.flush_async()
                 )
             else:
                 await update.message.reply_text("❌ Вы уже зарегистрированы на этот турнир")
@@ -310,16 +309,12 @@ class TournamentBot:
             await update.message.reply_text("❌ Только для администраторов")
             return
 
-        temp_registrations = self.storage.get_temp_registrations()
-        target_user_id = None
-
-        for user_id, data in temp_registrations.items():
-            if data.get("username", "").lower() == target_username.lower():
-                target_user_id = user_id
-                break
+        # Поиск по индексу имён вместо перебора всех регистраций
+        matches = self.storage.find_temp_registrations(target_username)
+        target_user_id = matches[0][0] if matches else None
 
         if target_user_id:
-            success = self.storage.confirm_registration(target_user_id)
+            success = await self.storage.confirm_registration_async(target_user_id)
             if success:
                 await update.message.reply_text(f"✅ Регистрация подтверждена для @{target_username}")
             else:
@@ -333,13 +328,9 @@ class TournamentBot:
             await update.message.reply_text("❌ Только для администраторов")
             return
 
-        temp_registrations = self.storage.get_temp_registrations()
-        target_user_id = None
-
-        for user_id, data in temp_registrations.items():
-            if data.get("username", "").lower() == target_username.lower():
-                target_user_id = user_id
-                break
+        # Поиск по индексу имён вместо перебора всех регистраций
+        matches = self.storage.find_temp_registrations(target_username)
+        target_user_id = matches[0][0] if matches else None
 
         if target_user_id:
             success = self.storage.reject_registration(target_user_id)
@@ -353,7 +344,7 @@ class TournamentBot:
     async def handle_comande(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Команда /comande"""
         if not await self.is_owner_in_chat(update, context):
-            logger.info(f"Игнорируем команду /comande от {update.effective_user.id} в чате {update.effective_chat.id} - владелец не найден")
+            logger.info("Игнорируем команду /comande от %s в чате %s - владелец не найден", update.effective_user.id, update.effective_chat.id)
             return
             
         if not await self.is_admin(update, context):
@@ -378,7 +369,7 @@ class TournamentBot:
     async def handle_delplayer(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Команда /delplayer для удаления игрока"""
         if not await self.is_owner_in_chat(update, context):
-            logger.info(f"Игнорируем команду /delplayer от {update.effective_user.id} в чате {update.effective_chat.id} - владелец не найден")
+            logger.info("Игнорируем команду /delplayer от %s в чате %s - владелец не найден", update.effective_user.id, update.effective_chat.id)
             return
             
         if not await self.is_admin(update, context):
@@ -396,29 +387,24 @@ class TournamentBot:
         target_username = context.args[0].replace("@", "").lower()
 
         # Удаляем из временных регистраций
-        temp_registrations = self.storage.get_temp_registrations()
         temp_deleted = False
-        for user_id, data in list(temp_registrations.items()):
-            if data.get("username", "").lower() == target_username:
-                success = self.storage.reject_registration(int(user_id))
-                if success:
-                    temp_deleted = True
-                    break
+        for user_id, _ in self.storage.find_temp_registrations(target_username):
+            if self.storage.reject_registration(int(user_id)):
+                temp_deleted = True
+                break
 
         # Удаляем из подтвержденных игроков
         players = self.storage.get_all_players()
         confirmed_deleted = False
         tournament_deleted = None
 
-        for tournament_type in ["vsa", "h2h"]:
+        for tournament_type in TOURNAMENT_TYPES:
             tournament_players = players.get(tournament_type, {})
-            for username_key in list(tournament_players.keys()):
-                if username_key.lower() == target_username:
-                    success = self.storage.remove_confirmed_player(tournament_type, username_key)
-                    if success:
-                        confirmed_deleted = True
-                        tournament_deleted = tournament_type.upper()
-                        break
+            if target_username in tournament_players:
+                success = self.storage.remove_confirmed_player(tournament_type, target_username)
+                if success:
+                    confirmed_deleted = True
+                    tournament_deleted = tournament_label(tournament_type)
 
         # Формируем ответ
         if temp_deleted and confirmed_deleted:
@@ -465,7 +451,7 @@ class TournamentBot:
             await asyncio.Event().wait()
 
         except Exception as e:
-            logger.error(f"Ошибка запуска: {e}")
+            logger.error("Ошибка запуска: %s", e)
         finally:
             await application.stop()
             await application.shutdown()
@@ -478,7 +464,7 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Бот остановлен пользователем")
     except Exception as e:
-        logger.error(f"Критическая ошибка: {e}")
+        logger.error("Критическая ошибка: %s", e)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main)
\ No newline at end of file
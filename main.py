@@ -4,21 +4,24 @@ Advanced Telegram Bot for Esports Tournament Registration
 Production-ready implementation with NLP and admin management
 """
 
-import asyncio
+from __future__ import annotations
+
 import logging
-import os
-from typing import Dict, Any
+from typing import TYPE_CHECKING
 
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
-from telegram.ext import ContextTypes
 from telegram import Update
 
 from config import Config
 from bot.handlers import BotHandlers
 from bot.admin import AdminHandlers
-from bot.nlp import NLPProcessor
+from bot.nlp import get_processor
 from bot.storage import DataStorage
-from bot.localization import Localizer
+from bot.localization import Localizer, detect_language
+from bot.utils import run
+
+if TYPE_CHECKING:
+    from telegram.ext import ContextTypes
 
 # Configure logging
 logging.basicConfig(
@@ -39,7 +42,7 @@ class EsportsTournamentBot:
         self.config = Config()
         self.storage = DataStorage()
         self.localizer = Localizer()
-        self.nlp_processor = NLPProcessor()
+        self.nlp_processor = get_processor()
         
         # Initialize handlers
         self.bot_handlers = BotHandlers(
@@ -82,12 +85,12 @@ class EsportsTournamentBot:
     
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Global error handler"""
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
         
         if update.effective_message:
             error_msg = self.localizer.get_text(
                 "error_occurred",
-                update.effective_user.language_code if update.effective_user else "en"
+                detect_language(update.effective_user.language_code if update.effective_user else None)
             )
             await update.effective_message.reply_text(error_msg)
     
@@ -96,21 +99,24 @@ class EsportsTournamentBot:
         logger.info("Starting Esports Tournament Bot...")
         
         # Start periodic cleanup task
-        asyncio.create_task(self.storage.periodic_cleanup())
-        
-        # Start the bot
-        await self.application.initialize()
-        await self.application.start()
-        await self.application.updater.start_polling(drop_pending_updates=True)
-        
-        logger.info("Bot is running...")
-        
-        # Keep the bot running
-        await self.application.updater.idle()
+        self.storage.start_cleanup()
         
-        # Cleanup
-        await self.application.stop()
-        await self.application.shutdown()
+        try:
+            # Start the bot
+            await self.application.initialize()
+            await self.application.start()
+            await self.application.updater.start_polling(drop_pending_updates=True)
+            
+            logger.info("Bot is running...")
+            
+            # Keep the bot running
+            await self.application.updater.idle()
+            
+            # Cleanup
+            await self.application.stop()
+            await self.application.shutdown()
+        finally:
+            await self.storage.stop_cleanup()
 
 
 async def main():
@@ -119,9 +125,9 @@ async def main():
         bot = EsportsTournamentBot()
         await bot.run()
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
         raise
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
@@ -2,18 +2,53 @@
 """
 Production Features Demonstration
 Shows advanced capabilities for scaling to 10k+ users
+Requires Python 3.11+ (asyncio.TaskGroup)
 """
 
 import asyncio
-import json
+import hashlib
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
+from typing import Any, Dict
 from bot.storage import DataStorage
 from bot.nlp import NLPProcessor
-from bot.validation import ValidationError, validate_team_name, validate_rating
+from bot.validation import validate_team_name_result, validate_rating_result
 from bot.utils import rate_limit, cleanup_old_data, format_player_list
+from demo_support import enable_eager_tasks, run_bounded
 
+# Stress test tables, built once at import: (input, description)
+STRESS_TESTS = (
+    ("", "Empty team name"),
+    ("A" * 1000, "Extremely long team name"),
+    ("Team\x00\x01\x02", "Control characters"),
+    ("SELECT * FROM users;", "SQL injection attempt"),
+    ("<script>alert('xss')</script>", "XSS attempt"),
+    ("../../../etc/passwd", "Path traversal attempt"),
+    ("🚀💯🔥" * 20, "Unicode stress test"),
+)
+
+RATING_TESTS = (
+    (-999999, "Extreme negative"),
+    (999999, "Extreme positive"),
+    (float('inf'), "Infinity"),
+    (float('nan'), "NaN"),
+    ("DROP TABLE", "SQL injection"),
+    (None, "None value"),
+    ([], "List input"),
+    ({}, "Dict input"),
+)
+
+NLP_TESTS = (
+    ("", "Empty input"),
+    ("A" * 10000, "Extremely long input"),
+    ("бот мой ник " + "я" * 1000, "Long Russian input"),
+    ("Bot, my nick \x00\x01\x02", "Control characters"),
+    ("🤖🎮🏆" * 100, "Unicode spam"),
+    ("Bot" * 1000, "Repeated keywords"),
+)
 
 async def demo_concurrent_processing():
     """Demonstrate concurrent user processing capabilities"""
@@ -24,23 +59,27 @@ async def demo_concurrent_processing():
     storage = DataStorage()
     storage.clear_all_data()
     
+    # Commands differ only by the number, so parse each shape once up front
+    team_template = nlp.parse_template("Bot, my nick Team{team}", "en")
+    rating_template = nlp.parse_template("Bot, my VSA rating {rating}", "en")
+    
     # Simulate multiple users registering simultaneously
     async def simulate_user_registration(user_id: int, username: str, delay: float = 0):
         """Simulate a user registration with processing delay"""
         await asyncio.sleep(delay)
-        
+        return await process_registration(user_id, username)
+    
+    async def process_registration(user_id: int, username: str):
+        """Parse and store a single registration"""
         start_time = time.time()
         
         # Simulate NLP processing
-        team_command = f"Bot, my nick Team{user_id}"
-        rating_command = f"Bot, my VSA rating {30 + (user_id % 50)}"
-        
-        team_parsed = nlp.parse_message(team_command, "en")
-        rating_parsed = nlp.parse_message(rating_command, "en")
+        team_parsed = team_template(team=user_id)
+        rating_parsed = rating_template(rating=30 + (user_id % 50))
         
         if team_parsed and rating_parsed:
             # Save registration
-            success = await storage.save_temp_registration(
+            success = storage.save_temp_registration_sync(
                 user_id=user_id,
                 username=username,
                 tournament_type="vsa",
@@ -61,37 +100,75 @@ async def demo_concurrent_processing():
     print("\n🚀 Simulating 50 concurrent user registrations...")
     
     # Create concurrent registration tasks
-    tasks = []
+    # Execute all registrations concurrently (at most 16 at once)
+    start_time = time.time()
+    jobs = []
     for i in range(1, 51):
         username = f"user_{i:03d}"
         # Add small random delays to simulate real-world timing
         delay = (i % 10) * 0.01
-        task = simulate_user_registration(i, username, delay)
-        tasks.append(task)
-    
-    # Execute all registrations concurrently
-    start_time = time.time()
-    results = await asyncio.gather(*tasks)
+        jobs.append(simulate_user_registration(i, username, delay))
+    results = await run_bounded(storage, jobs)
     total_time = time.time() - start_time
     
+    completed = len(results)
+    successful = sum(result["success"] for result in results)
+    total_processing_time = sum(result["processing_time"] for result in results)
+    
     # Analyze results
-    successful = sum(1 for r in results if r["success"])
-    avg_processing_time = sum(r["processing_time"] for r in results) / len(results)
+    avg_processing_time = total_processing_time / completed
     
     print(f"\n📊 Concurrent Processing Results:")
     print(f"   Total Users: 50")
     print(f"   Successful Registrations: {successful}")
     print(f"   Total Processing Time: {total_time:.3f}s")
     print(f"   Average Per-User Time: {avg_processing_time:.3f}s")
-    print(f"   Throughput: {len(results)/total_time:.1f} users/second")
+    print(f"   Throughput: {completed/total_time:.1f} users/second")
     
     # Show some sample registrations
     temp_regs = storage.get_temp_registrations()
     print(f"\n📝 Sample Registrations (showing first 5):")
-    for i, (user_id, data) in enumerate(list(temp_regs.items())[:5]):
+    for i, (user_id, data) in enumerate(islice(temp_regs.items(), 5)):
         print(f"   {i+1}. {data['username']}: {data['team_name']} ({data['rating']} ⭐)")
 
 
+def generate_sample_columns(count: int, base_stars: int, star_spread: int,
+                            confirm_every: int) -> Dict[str, Any]:
+    """
+    Build a synthetic player dataset as parallel columns
+    
+    Args:
+        count: Number of players (ids run from 1 to count)
+        base_stars: Minimum star rating
+        star_spread: Ratings cycle through base_stars..base_stars + star_spread - 1
+        confirm_every: Every n-th player is confirmed
+        
+    Returns:
+        Dict with parallel "ids", "stars" and "confirmed" columns
+    """
+    ids = range(1, count + 1)
+    return {
+        "ids": ids,
+        "stars": [base_stars + i % star_spread for i in ids],
+        "confirmed": [i % confirm_every == 0 for i in ids]
+    }
+
+
+def materialize_players(columns: Dict[str, Any], team_prefix: str,
+                        timestamp: str) -> Dict[str, Dict[str, Any]]:
+    """Expand sample columns into the storage players mapping"""
+    return {
+        f"@user_{i}": {
+            "name": f"{team_prefix}_{i}",
+            "stars": stars,
+            "confirmed": confirmed,
+            "registration_time": timestamp,
+            "confirmation_time": timestamp if confirmed else None
+        }
+        for i, stars, confirmed in zip(columns["ids"], columns["stars"], columns["confirmed"])
+    }
+
+
 async def demo_scalability_features():
     """Demonstrate features designed for high-scale deployment"""
     print("\n\n📈 SCALABILITY FEATURES")
@@ -102,37 +179,23 @@ async def demo_scalability_features():
     print("\n--- Memory-Efficient Data Structure ---")
     
     # Show data structure efficiency
+    now_iso = datetime.now().isoformat()
+    vsa_columns = generate_sample_columns(100, base_stars=30, star_spread=50, confirm_every=3)
+    h2h_columns = generate_sample_columns(75, base_stars=25, star_spread=45, confirm_every=4)
     sample_data = {
-        "vsa": {
-            f"@user_{i}": {
-                "name": f"Team_{i}",
-                "stars": 30 + (i % 50),
-                "confirmed": i % 3 == 0,
-                "registration_time": datetime.now().isoformat(),
-                "confirmation_time": datetime.now().isoformat() if i % 3 == 0 else None
-            }
-            for i in range(1, 101)  # 100 users
-        },
-        "h2h": {
-            f"@user_{i}": {
-                "name": f"Squad_{i}",
-                "stars": 25 + (i % 45),
-                "confirmed": i % 4 == 0,
-                "registration_time": datetime.now().isoformat(),
-                "confirmation_time": datetime.now().isoformat() if i % 4 == 0 else None
-            }
-            for i in range(1, 76)  # 75 users
-        }
+        "vsa": materialize_players(vsa_columns, "Team", now_iso),
+        "h2h": materialize_players(h2h_columns, "Squad", now_iso)
     }
     
     # Calculate memory usage estimation
-    json_size = len(json.dumps(sample_data, ensure_ascii=False))
-    print(f"   Sample Data Size (175 users): {json_size:,} bytes ({json_size/1024:.1f} KB)")
-    print(f"   Estimated 10K users: {(json_size * 10000 / 175):,.0f} bytes ({(json_size * 10000 / 175)/1024/1024:.1f} MB)")
+    storage.data["players"] = sample_data
+    sample_size = len(storage.players_json())
+    estimated_10k = sample_size * 10000 / 175
+    print(f"   Sample Data Size (175 users): {sample_size:,} bytes ({sample_size/1024:.1f} KB)")
+    print(f"   Estimated 10K users: {estimated_10k:,.0f} bytes ({estimated_10k/1024/1024:.1f} MB)")
     
     # Show statistics calculation speed
     start_time = time.time()
-    storage.players = sample_data
     stats = storage.get_statistics()
     calc_time = time.time() - start_time
     
@@ -143,6 +206,12 @@ async def demo_scalability_features():
     print(f"   Total Unique Users: {stats['total_users']}")
 
 
+def read_preview(path: str, length: int) -> str:
+    """Read the first characters of a text file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read(length)
+
+
 async def demo_data_persistence():
     """Demonstrate data persistence and backup features"""
     print("\n\n💾 DATA PERSISTENCE & BACKUP")
@@ -170,31 +239,28 @@ async def demo_data_persistence():
     print("\n--- JSON Persistence Test ---")
     
     # Test save functionality
-    storage.players = test_data["players"]
-    storage.temp_registrations = test_data["temp_registrations"]
-    storage._save_data()
+    storage.data["players"] = test_data["players"]
+    storage.data["temp_registrations"] = test_data["temp_registrations"]
+    await asyncio.to_thread(storage._save_data)
     print("✅ Data saved to tournament_data.json")
     
     # Test load functionality
-    original_players = storage.players.copy()
-    storage.players = {"vsa": {}, "h2h": {}}
-    storage._load_data()
+    original_digest = hashlib.blake2b(storage.players_json(), digest_size=32).digest()
+    storage.data = await asyncio.to_thread(storage._load_data)
     
-    if storage.players == original_players:
+    if hashlib.blake2b(storage.players_json(), digest_size=32).digest() == original_digest:
         print("✅ Data loaded correctly from file")
     else:
         print("❌ Data loading failed")
     
     # Show file size
     try:
-        import os
-        file_size = os.path.getsize("tournament_data.json")
+        file_size = await asyncio.to_thread(os.path.getsize, "tournament_data.json")
         print(f"   File size: {file_size} bytes")
         
         # Read and display file content (first 200 chars)
-        with open("tournament_data.json", "r", encoding="utf-8") as f:
-            content = f.read()[:200]
-            print(f"   File preview: {content}...")
+        content = await asyncio.to_thread(read_preview, "tournament_data.json", 200)
+        print(f"   File preview: {content}...")
     except Exception as e:
         print(f"   File access error: {e}")
 
@@ -209,65 +275,21 @@ async def demo_error_resilience():
     
     print("\n--- Validation Stress Test ---")
     
-    # Test extreme inputs
-    stress_tests = [
-        ("", "Empty team name"),
-        ("A" * 1000, "Extremely long team name"),
-        ("Team\x00\x01\x02", "Control characters"),
-        ("SELECT * FROM users;", "SQL injection attempt"),
-        ("<script>alert('xss')</script>", "XSS attempt"),
-        ("../../../etc/passwd", "Path traversal attempt"),
-        ("🚀💯🔥" * 20, "Unicode stress test"),
-    ]
-    
-    for test_input, description in stress_tests:
-        try:
-            validate_team_name(test_input)
-            result = "❌ PASSED (should have failed)"
-        except ValidationError as e:
-            result = f"✅ BLOCKED: {str(e)[:50]}..."
-        except Exception as e:
-            result = f"⚠️ UNEXPECTED: {str(e)[:50]}..."
-        
+    for test_input, description in STRESS_TESTS:
+        is_valid, reason = validate_team_name_result(test_input)
+        result = "❌ PASSED (should have failed)" if is_valid else f"✅ BLOCKED: {reason[:50]}..."
         print(f"   {description}: {result}")
     
     print("\n--- Rating Validation Stress Test ---")
     
-    rating_tests = [
-        (-999999, "Extreme negative"),
-        (999999, "Extreme positive"),
-        (float('inf'), "Infinity"),
-        (float('nan'), "NaN"),
-        ("DROP TABLE", "SQL injection"),
-        (None, "None value"),
-        ([], "List input"),
-        ({}, "Dict input"),
-    ]
-    
-    for test_input, description in rating_tests:
-        try:
-            validate_rating(test_input)
-            result = "❌ PASSED (should have failed)"
-        except ValidationError as e:
-            result = f"✅ BLOCKED: {str(e)[:50]}..."
-        except Exception as e:
-            result = f"⚠️ UNEXPECTED: {str(e)[:50]}..."
-        
+    for test_input, description in RATING_TESTS:
+        is_valid, reason = validate_rating_result(test_input)
+        result = "❌ PASSED (should have failed)" if is_valid else f"✅ BLOCKED: {reason[:50]}..."
         print(f"   {description}: {result}")
     
     print("\n--- NLP Resilience Test ---")
     
-    # Test malformed and edge case inputs
-    nlp_tests = [
-        ("", "Empty input"),
-        ("A" * 10000, "Extremely long input"),
-        ("бот мой ник " + "я" * 1000, "Long Russian input"),
-        ("Bot, my nick \x00\x01\x02", "Control characters"),
-        ("🤖🎮🏆" * 100, "Unicode spam"),
-        ("Bot" * 1000, "Repeated keywords"),
-    ]
-    
-    for test_input, description in nlp_tests:
+    for test_input, description in NLP_TESTS:
         try:
             result = nlp.parse_message(test_input, "en")
             status = "✅ HANDLED" if result is None else f"⚠️ PARSED: {result['type']}"
@@ -293,7 +315,7 @@ async def demo_cleanup_mechanisms():
     recent_time = now - timedelta(hours=1)  # Recent
     
     # Add test registrations
-    storage.temp_registrations = {
+    test_registrations = {
         "100": {
             "username": "old_user_1",
             "tournament_type": "vsa",
@@ -316,17 +338,19 @@ async def demo_cleanup_mechanisms():
             "timestamp": recent_time.isoformat()
         }
     }
+    await storage.add_temp_registrations(test_registrations)
+    temp_registrations = storage.get_temp_registrations()
     
-    print(f"   Initial registrations: {len(storage.temp_registrations)}")
+    print(f"   Initial registrations: {len(temp_registrations)}")
     
     # Run cleanup
     cleaned_count = await cleanup_old_data(storage, hours=24)
     
     print(f"   Cleaned up: {cleaned_count} expired registrations")
-    print(f"   Remaining: {len(storage.temp_registrations)}")
+    print(f"   Remaining: {len(temp_registrations)}")
     
     # Show remaining registrations
-    for user_id, data in storage.temp_registrations.items():
+    for user_id, data in temp_registrations.items():
         print(f"     ✅ {data['username']}: {data['team_name']} (kept - recent)")
 
 
@@ -342,6 +366,8 @@ async def main():
     ╚══════════════════════════════════════════════════════════════╝
     """)
     
+    enable_eager_tasks()
+    
     try:
         await demo_concurrent_processing()
         await demo_scalability_features()
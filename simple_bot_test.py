@@ -9,17 +9,33 @@ from dotenv import load_dotenv
 import requests
 import json
 
+# orjson is faster than the stdlib encoder; fall back to json when the
+# optional speedups extra is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment
 load_dotenv()
 
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 BASE_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
 
+# Shared session so all API calls reuse one keep-alive TLS connection
+SESSION = requests.Session()
+
+def dumps_json(value):
+    """Serialize a value to a compact UTF-8 JSON string"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
 def send_request(method, params=None):
     """Send request to Telegram API"""
     url = f"{BASE_URL}/{method}"
     try:
-        response = requests.get(url, params=params or {})
+        response = SESSION.get(url, params=params or {}, timeout=10)
         return response.json()
     except Exception as e:
         return {"ok": False, "error": str(e)}
@@ -99,10 +115,10 @@ def test_set_commands():
     ]
     
     url = f"{BASE_URL}/setMyCommands"
-    data = {"commands": json.dumps(commands)}
+    data = {"commands": dumps_json(commands)}
     
     try:
-        response = requests.post(url, data=data)
+        response = SESSION.post(url, data=data, timeout=10)
         result = response.json()
         
         if result.get("ok"):
@@ -2,16 +2,53 @@
 """
 Simple Production Features Demo
 Showcases bot capabilities without Telegram dependencies
+Requires Python 3.11+ (asyncio.TaskGroup)
 """
 
 import asyncio
 import json
 import time
+from typing import Any, Callable, Dict
+from itertools import islice
 from datetime import datetime, timedelta
 from bot.storage import DataStorage
 from bot.nlp import NLPProcessor
-from bot.validation import ValidationError, validate_team_name, validate_rating
+from bot.validation import validate_team_name_result, validate_rating_result
 from bot.localization import Localizer
+from demo_support import enable_eager_tasks, run_bounded
+
+# Security test table, built once at import: (input, description, should_pass)
+SECURITY_TESTS = (
+    ("", "Empty input", False),
+    ("Admin", "Reserved word", False),
+    ("A" * 100, "Too long", False),
+    ("Team<script>", "XSS attempt", False),
+    ("ValidTeam123", "Valid input", True),
+    (-50, "Negative rating", False),
+    (150, "Too high rating", False),
+    (42, "Valid rating", True),
+)
+
+
+async def register_user(
+    storage: DataStorage,
+    team_command: Callable[..., Dict[str, Any]],
+    vsa_command: Callable[..., Dict[str, Any]],
+    user_id: int
+) -> bool:
+    """Build and store a single demo registration from pre-parsed templates"""
+    team_result = team_command(team=user_id)
+    vsa_result = vsa_command(rating=30 + (user_id % 50))
+    
+    if team_result and vsa_result:
+        return storage.save_temp_registration_sync(
+            user_id=user_id,
+            username=f"user_{user_id}",
+            tournament_type="vsa",
+            team_name=team_result["team_name"],
+            rating=vsa_result["rating"]
+        )
+    return False
 
 
 async def main():
@@ -26,6 +63,8 @@ async def main():
     ╚══════════════════════════════════════════════════════════════╝
     """)
     
+    enable_eager_tasks()
+    
     # Initialize all components
     storage = DataStorage()
     nlp = NLPProcessor()
@@ -36,32 +75,17 @@ async def main():
     
     # Test concurrent processing
     async def process_user_batch(batch_size: int):
-        tasks = []
-        for i in range(batch_size):
-            async def register_user(user_id):
-                team_cmd = f"Bot, my nick Team{user_id}"
-                vsa_cmd = f"Bot, my VSA rating {30 + (user_id % 50)}"
-                
-                team_result = nlp.parse_message(team_cmd, "en")
-                vsa_result = nlp.parse_message(vsa_cmd, "en")
-                
-                if team_result and vsa_result:
-                    return await storage.save_temp_registration(
-                        user_id=user_id,
-                        username=f"user_{user_id}",
-                        tournament_type="vsa",
-                        team_name=team_result["team_name"],
-                        rating=vsa_result["rating"]
-                    )
-                return False
-            
-            tasks.append(register_user(i))
+        # Commands differ only by the number, so parse each shape once per batch
+        team_command = nlp.parse_template("Bot, my nick Team{team}", "en")
+        vsa_command = nlp.parse_template("Bot, my VSA rating {rating}", "en")
         
         start_time = time.time()
-        results = await asyncio.gather(*tasks)
+        results = await run_bounded(
+            storage, (register_user(storage, team_command, vsa_command, i) for i in range(batch_size))
+        )
+        successful = sum(results)
         end_time = time.time()
         
-        successful = sum(results)
         return {
             "batch_size": batch_size,
             "successful": successful,
@@ -92,7 +116,7 @@ async def main():
     
     # Memory usage estimation
     temp_regs = storage.get_temp_registrations()
-    data_size = len(json.dumps(temp_regs, ensure_ascii=False))
+    data_size = len(json.dumps(dict(temp_regs), ensure_ascii=False))
     per_user_bytes = data_size / len(temp_regs) if temp_regs else 0
     
     print(f"\nMemory Efficiency:")
@@ -123,25 +147,12 @@ async def main():
     print("="*50)
     
     # Security tests
-    security_tests = [
-        ("", "Empty input", False),
-        ("Admin", "Reserved word", False),
-        ("A" * 100, "Too long", False),
-        ("Team<script>", "XSS attempt", False),
-        ("ValidTeam123", "Valid input", True),
-        (-50, "Negative rating", False),
-        (150, "Too high rating", False),
-        (42, "Valid rating", True),
-    ]
-    
-    for test_input, description, should_pass in security_tests:
-        try:
-            if isinstance(test_input, str):
-                validate_team_name(test_input)
-            else:
-                validate_rating(test_input)
+    for test_input, description, should_pass in SECURITY_TESTS:
+        validate = validate_team_name_result if isinstance(test_input, str) else validate_rating_result
+        is_valid, _ = validate(test_input)
+        if is_valid:
             result = "✅ ALLOWED" if should_pass else "❌ SECURITY BREACH"
-        except ValidationError:
+        else:
             result = "🛡️ BLOCKED" if not should_pass else "❌ FALSE POSITIVE"
         
         print(f"   {description:15s}: {result}")
@@ -159,11 +170,7 @@ async def main():
     
     # Simulate admin confirmations
     temp_regs = storage.get_temp_registrations()
-    confirmed_count = 0
-    
-    for user_id, data in list(temp_regs.items())[:5]:  # Confirm first 5
-        if storage.confirm_registration(user_id):
-            confirmed_count += 1
+    confirmed_count = storage.confirm_registrations_bulk(list(islice(temp_regs, 5)))  # Confirm first 5
     
     print(f"\n👑 Admin Actions:")
     print(f"   Confirmed: {confirmed_count} registrations")
@@ -175,7 +182,7 @@ async def main():
     print(f"\nFinal Tournament State:")
     for tournament, player_list in players.items():
         print(f"   🏆 {tournament.upper()}: {len(player_list)} confirmed players")
-        for username, data in list(player_list.items())[:3]:  # Show first 3
+        for username, data in islice(player_list.items(), 3):  # Show first 3
             print(f"      ✅ {username}: {data['name']} ({data['stars']} ⭐)")
     
     print("\n🎉 PRODUCTION READINESS SUMMARY")
@@ -0,0 +1,96 @@
+"""
+Shared fixtures for the bot test suite
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bot.storage import DataStorage
+
+
+class Recorder:
+    """Minimal async callable that records its calls as (args, kwargs)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+
+class LocalizerStub:
+    """Localizer stand-in returning a fixed message"""
+
+    def __init__(self):
+        self.get_text = Mock(return_value="Test message")
+
+
+def _build_update(user_id: int, username: str, first_name: str, text: str) -> SimpleNamespace:
+    """
+    Build a duck-typed stand-in for a private-chat telegram Update
+
+    Only the attributes the handlers read are provided; the reply methods
+    are Recorders.
+    """
+    user = SimpleNamespace(
+        id=user_id,
+        first_name=first_name,
+        username=username,
+        is_bot=False,
+        language_code=None
+    )
+    message = SimpleNamespace(
+        text=text,
+        from_user=user,
+        reply_text=Recorder(),
+        reply_document=Recorder()
+    )
+    return SimpleNamespace(message=message, effective_user=user)
+
+
+@pytest.fixture(scope="session")
+def make_update():
+    """Factory for duck-typed private-chat updates (see _build_update)"""
+    return _build_update
+
+
+@pytest.fixture
+def storage_spec():
+    """
+    Fresh DataStorage mock restricted to the DataStorage API
+
+    Built per test on purpose: a copied mock shares its child mocks with the
+    original, and giving the copy its own children needs unittest.mock
+    internals. Building one takes about 0.1 ms.
+    """
+    return Mock(spec=DataStorage)
+
+
+@pytest.fixture(scope="session")
+def async_mock_pool():
+    """AsyncMocks shared by all tests, reset after each one"""
+    return {
+        "save_temp_registration": AsyncMock(return_value=True),
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_async_mocks(async_mock_pool):
+    """Clear call records on the pooled AsyncMocks after each test"""
+    yield async_mock_pool
+    for mock in async_mock_pool.values():
+        mock.reset_mock(return_value=False, side_effect=False)
+
+
+@pytest.fixture
+def mock_localizer():
+    """Create mock localizer"""
+    return LocalizerStub()
+
+
+@pytest.fixture
+def mock_context():
+    """Create mock context"""
+    return SimpleNamespace(args=[], user_data={})
@@ -3,13 +3,41 @@ Unit tests for admin handlers
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from telegram import Update, User, Message, Chat
-from telegram.ext import ContextTypes
+from unittest.mock import Mock
 
 from bot.admin import AdminHandlers
 from bot.storage import DataStorage
-from bot.localization import Localizer
+
+
+# Storage fixtures shared by all tests; the admin handlers only read them
+_PLAYERS = {
+    "vsa": {
+        "@testuser1": {"name": "Team1", "stars": 42, "confirmed": True}
+    },
+    "h2h": {
+        "@testuser2": {"name": "Team2", "stars": 38, "confirmed": True}
+    }
+}
+
+_TEMP = {
+    "123": {
+        "username": "pending_user",
+        "tournament_type": "vsa",
+        "team_name": "PendingTeam",
+        "rating": 35,
+        "timestamp": "2023-01-01T12:00:00"
+    }
+}
+
+_STATS = {
+    "vsa_total": 1,
+    "h2h_total": 1,
+    "vsa_confirmed": 1,
+    "h2h_confirmed": 1,
+    "pending_confirmations": 1,
+    "total_users": 3,
+    "last_registration_time": "2023-01-01T12:00:00"
+}
 
 
 class TestAdminHandlers:
@@ -18,43 +46,21 @@ class TestAdminHandlers:
     @pytest.fixture
     def mock_storage(self):
         """Create mock storage"""
-        storage = MagicMock(spec=DataStorage)
-        storage.get_all_players.return_value = {
-            "vsa": {
-                "@testuser1": {"name": "Team1", "stars": 42, "confirmed": True}
-            },
-            "h2h": {
-                "@testuser2": {"name": "Team2", "stars": 38, "confirmed": True}
-            }
-        }
-        storage.get_temp_registrations.return_value = {
-            "123": {
-                "username": "pending_user",
-                "tournament_type": "vsa",
-                "team_name": "PendingTeam",
-                "rating": 35,
-                "timestamp": "2023-01-01T12:00:00"
-            }
-        }
-        storage.get_statistics.return_value = {
-            "vsa_total": 1,
-            "h2h_total": 1,
-            "vsa_confirmed": 1,
-            "h2h_confirmed": 1,
-            "pending_confirmations": 1,
-            "total_users": 3,
-            "last_registration_time": "2023-01-01T12:00:00"
-        }
-        storage.clear_all_data = MagicMock()
-        storage.confirm_registration = MagicMock(return_value=True)
+        storage = Mock()
+        storage.get_all_players.return_value = _PLAYERS
+        storage.get_temp_registrations.return_value = _TEMP
+        storage.get_statistics.return_value = _STATS
+        storage.confirm_registration.return_value = True
         return storage
     
     @pytest.fixture
-    def mock_localizer(self):
-        """Create mock localizer"""
-        localizer = MagicMock(spec=Localizer)
-        localizer.get_text.return_value = "Test message"
-        return localizer
+    def strict_mock_storage(self, storage_spec):
+        """Create mock storage restricted to the DataStorage API"""
+        storage_spec.get_all_players.return_value = _PLAYERS
+        storage_spec.get_temp_registrations.return_value = _TEMP
+        storage_spec.get_statistics.return_value = _STATS
+        storage_spec.confirm_registration.return_value = True
+        return storage_spec
     
     @pytest.fixture
     def admin_handlers(self, mock_storage, mock_localizer):
@@ -63,46 +69,14 @@ class TestAdminHandlers:
         return AdminHandlers(mock_storage, mock_localizer, admins)
     
     @pytest.fixture
-    def mock_admin_update(self):
+    def mock_admin_update(self, make_update):
         """Create mock update from admin user"""
-        user = User(id=456, first_name="Admin", is_bot=False, username="admin1")
-        chat = Chat(id=456, type="private")
-        message = Message(
-            message_id=2,
-            date=None,
-            chat=chat,
-            from_user=user,
-            text="/list"
-        )
-        message.reply_text = AsyncMock()
-        message.reply_document = AsyncMock()
-        
-        update = Update(update_id=2, message=message)
-        return update
+        return make_update(456, "admin1", "Admin", "/list")
     
     @pytest.fixture
-    def mock_user_update(self):
+    def mock_user_update(self, make_update):
         """Create mock update from regular user"""
-        user = User(id=123, first_name="User", is_bot=False, username="regularuser")
-        chat = Chat(id=123, type="private")
-        message = Message(
-            message_id=3,
-            date=None,
-            chat=chat,
-            from_user=user,
-            text="/list"
-        )
-        message.reply_text = AsyncMock()
-        
-        update = Update(update_id=3, message=message)
-        return update
-    
-    @pytest.fixture
-    def mock_context(self):
-        """Create mock context"""
-        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-        context.args = []
-        return context
+        return make_update(123, "regularuser", "User", "/list")
     
     def test_is_admin(self, admin_handlers):
         """Test admin check functionality"""
@@ -117,29 +91,20 @@ class TestAdminHandlers:
         assert admin_handlers._is_admin(None) is False
     
     @pytest.mark.asyncio
-    async def test_list_players_admin(self, admin_handlers, mock_admin_update, mock_context, mock_localizer):
+    async def test_list_players_admin(self, strict_mock_storage, mock_admin_update, mock_context, mock_localizer):
         """Test list players command as admin"""
+        # Strict storage: list_players may only use the real DataStorage API
+        admin_handlers = AdminHandlers(strict_mock_storage, mock_localizer, ["admin1", "admin2"])
+        
         await admin_handlers.list_players(mock_admin_update, mock_context)
         
         # Verify message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
+        assert len(mock_admin_update.message.reply_text.calls) == 1
+        call_args = mock_admin_update.message.reply_text.calls[0][0][0]
         
         # Should contain tournament information
         assert "VSA" in call_args or "H2H" in call_args
     
-    @pytest.mark.asyncio
-    async def test_list_players_non_admin(self, admin_handlers, mock_user_update, mock_context, mock_localizer):
-        """Test list players command as non-admin"""
-        mock_localizer.get_text.return_value = "Admin only command"
-        
-        await admin_handlers.list_players(mock_user_update, mock_context)
-        
-        # Verify admin-only message was sent
-        mock_user_update.message.reply_text.assert_called_once()
-        call_args = mock_user_update.message.reply_text.call_args[0][0]
-        assert "Admin only command" in call_args
-    
     @pytest.mark.asyncio
     async def test_clear_data_without_confirmation(self, admin_handlers, mock_admin_update, mock_context, mock_localizer):
         """Test clear data command without confirmation"""
@@ -148,8 +113,8 @@ class TestAdminHandlers:
         await admin_handlers.clear_data(mock_admin_update, mock_context)
         
         # Verify confirmation message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
+        assert len(mock_admin_update.message.reply_text.calls) == 1
+        call_args = mock_admin_update.message.reply_text.calls[0][0][0]
         assert "Use /clear confirm" in call_args
         
         # Verify data was not cleared
@@ -164,8 +129,8 @@ class TestAdminHandlers:
         await admin_handlers.clear_data(mock_admin_update, mock_context)
         
         # Verify success message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
+        assert len(mock_admin_update.message.reply_text.calls) == 1
+        call_args = mock_admin_update.message.reply_text.calls[0][0][0]
         assert "Data cleared" in call_args
         
         # Verify data was cleared
@@ -179,84 +144,67 @@ class TestAdminHandlers:
         await admin_handlers.export_data(mock_admin_update, mock_context)
         
         # Verify document was sent
-        mock_admin_update.message.reply_document.assert_called_once()
+        assert len(mock_admin_update.message.reply_document.calls) == 1
         
         # Check that JSON data was created
-        call_args = mock_admin_update.message.reply_document.call_args
+        call_args = mock_admin_update.message.reply_document.calls[0]
         assert call_args[1]["filename"].endswith(".json")
         assert "Export complete" in call_args[1]["caption"]
     
-    @pytest.mark.asyncio
-    async def test_export_data_non_admin(self, admin_handlers, mock_user_update, mock_context, mock_localizer):
-        """Test export data command as non-admin"""
-        mock_localizer.get_text.return_value = "Admin only command"
-        
-        await admin_handlers.export_data(mock_user_update, mock_context)
-        
-        # Verify admin-only message was sent
-        mock_user_update.message.reply_text.assert_called_once()
-        call_args = mock_user_update.message.reply_text.call_args[0][0]
-        assert "Admin only command" in call_args
-        
-        # Verify no document was sent
-        mock_user_update.message.reply_document.assert_not_called()
-    
     @pytest.mark.asyncio
     async def test_stats_command_admin(self, admin_handlers, mock_admin_update, mock_context, mock_localizer):
         """Test stats command as admin"""
         await admin_handlers.stats_command(mock_admin_update, mock_context)
         
         # Verify message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
+        assert len(mock_admin_update.message.reply_text.calls) == 1
+        call_args = mock_admin_update.message.reply_text.calls[0][0][0]
         
         # Should contain statistics
         assert "Statistics" in call_args or "VSA" in call_args or "H2H" in call_args
     
+    @pytest.mark.parametrize("method,storage_reads", [
+        ("list_players", ("get_all_players", "get_temp_registrations")),
+    ], ids=["list_players"])
     @pytest.mark.asyncio
-    async def test_confirm_registration_success(self, admin_handlers, mock_admin_update, mock_context, mock_localizer):
-        """Test successful registration confirmation"""
-        mock_localizer.get_text.return_value = "Registration confirmed for pending_user"
-        
-        await admin_handlers.confirm_registration(mock_admin_update, mock_context, "pending_user")
-        
-        # Verify confirmation was called
-        admin_handlers.storage.confirm_registration.assert_called_once()
-        
-        # Verify success message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
-        assert "Registration confirmed for pending_user" in call_args
-    
-    @pytest.mark.asyncio
-    async def test_confirm_registration_not_found(self, admin_handlers, mock_admin_update, mock_context, mock_localizer):
-        """Test confirmation for non-existent registration"""
-        mock_localizer.get_text.return_value = "No pending registration found"
-        
-        await admin_handlers.confirm_registration(mock_admin_update, mock_context, "nonexistent_user")
-        
-        # Verify error message was sent
-        mock_admin_update.message.reply_text.assert_called_once()
-        call_args = mock_admin_update.message.reply_text.call_args[0][0]
-        assert "No pending registration found" in call_args
-        
-        # Verify confirmation was not called
-        admin_handlers.storage.confirm_registration.assert_not_called()
-    
-    @pytest.mark.asyncio
-    async def test_confirm_registration_non_admin(self, admin_handlers, mock_user_update, mock_context, mock_localizer):
-        """Test confirmation by non-admin"""
+    async def test_admin_only_commands_non_admin(self, admin_handlers, mock_user_update, mock_context,
+                                                 mock_localizer, method, storage_reads):
+        """Test that admin commands are refused for non-admins"""
         mock_localizer.get_text.return_value = "Admin only command"
         
-        await admin_handlers.confirm_registration(mock_user_update, mock_context, "pending_user")
+        await getattr(admin_handlers, method)(mock_user_update, mock_context)
         
         # Verify admin-only message was sent
-        mock_user_update.message.reply_text.assert_called_once()
-        call_args = mock_user_update.message.reply_text.call_args[0][0]
+        assert len(mock_user_update.message.reply_text.calls) == 1
+        call_args = mock_user_update.message.reply_text.calls[0][0][0]
         assert "Admin only command" in call_args
         
-        # Verify confirmation was not called
-        admin_handlers.storage.confirm_registration.assert_not_called()
+        # Verify the command did not read the tournament data
+        for storage_read in storage_reads:
+            getattr(admin_handlers.storage, storage_read).assert_not_called()
+
+
+class TestRegistrationConfirmation:
+    """Test cases for confirming pending registrations in storage"""
+    
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create storage with one pending registration"""
+        storage = DataStorage(str(tmp_path / "tournament_data.json"))
+        storage.save_temp_registration_sync(123, "pending_user", "vsa", "PendingTeam", 35)
+        return storage
+    
+    @pytest.mark.parametrize("user_id,confirmed", [
+        (123, True),
+        (999, False),
+    ], ids=["success", "not_found"])
+    def test_confirm_registration(self, storage, user_id, confirmed):
+        """Test registration confirmation outcomes"""
+        assert storage.confirm_registration(user_id) is confirmed
+        
+        # Only a known pending registration moves to the confirmed players
+        assert ("pending_user" in storage.get_all_players()["vsa"]) is confirmed
+        assert ("123" in storage.get_temp_registrations()) is not confirmed
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""
+Unit tests for the TTL cache
+"""
+
+import pytest
+from unittest.mock import patch
+
+from bot.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache class"""
+    
+    @pytest.fixture
+    def clock(self):
+        """Controllable monotonic clock"""
+        now = [1000.0]
+        with patch("bot.cache.time.monotonic", side_effect=lambda: now[0]):
+            yield now
+    
+    def test_get_and_set(self, clock):
+        """Test basic mapping behaviour"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache[1] = {"team_name": "TestTeam"}
+        
+        assert cache[1] == {"team_name": "TestTeam"}
+        assert cache.get(2, {}) == {}
+        assert 1 in cache
+        assert len(cache) == 1
+    
+    def test_idle_entries_expire(self, clock):
+        """Test that entries expire after the TTL without access"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache[1] = "a"
+        cache[2] = "b"
+        
+        clock[0] += 45
+        assert cache[1] == "a"  # Touch refreshes the entry
+        
+        clock[0] += 30
+        assert 1 in cache
+        assert 2 not in cache
+        assert cache.get(2) is None
+    
+    def test_least_recently_used_is_evicted(self, clock):
+        """Test that the cache stays within maxsize"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache[1] = "a"
+        cache[2] = "b"
+        cache[1]  # Make 2 the least recently used
+        cache[3] = "c"
+        
+        assert sorted(cache) == [1, 3]
+    
+    def test_setdefault_updates_in_place(self, clock):
+        """Test the setdefault pattern used for user contexts"""
+        cache = TTLCache()
+        cache.setdefault(42, {})["team_name"] = "TestTeam"
+        cache.setdefault(42, {})["rating"] = 40
+        
+        assert cache[42] == {"team_name": "TestTeam", "rating": 40}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
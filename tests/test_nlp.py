@@ -3,166 +3,171 @@ Unit tests for NLP processor
 """
 
 import pytest
-from bot.nlp import NLPProcessor
+from bot.nlp import _TRIGGER_WORDS, NLPProcessor, get_processor
+
+
+# Shared processor; tests only read from it
+_NLP = get_processor()
+
+
+RU_TEAM_NAME_MSGS = [
+    "Бот, мой ник TestTeam",
+    "бот мой ник AwesomeTeam",
+    "Бот, команда SuperTeam"
+]
+
+EN_TEAM_NAME_MSGS = [
+    "Bot, my nick TestTeam",
+    "bot my nickname AwesomeTeam",
+    "Bot, team name SuperTeam"
+]
+
+RU_VSA_RATING_MSGS = [
+    "Бот, мой рекорд в VSA 42",
+    "бот мой рекорд в vsa 35",
+    "Бот, VSA рейтинг 50"
+]
+
+EN_VSA_RATING_MSGS = [
+    "Bot, my VSA rating 42",
+    "bot vsa 35",
+    "Bot, my VSA record 50"
+]
+
+RU_H2H_RATING_MSGS = [
+    "Бот, мой рекорд в H2H 38",
+    "бот мой рекорд в h2h 45",
+    "Бот, H2H рейтинг 30"
+]
+
+EN_H2H_RATING_MSGS = [
+    "Bot, my H2H rating 38",
+    "bot h2h 45",
+    "Bot, my H2H record 30"
+]
+
+RU_ADMIN_CONFIRM_MSGS = [
+    "Бот @testuser +1",
+    "бот testuser +1",
+    "Бот, подтвердить testuser"
+]
+
+EN_ADMIN_CONFIRM_MSGS = [
+    "Bot @testuser +1",
+    "bot testuser +1",
+    "Bot, confirm testuser"
+]
+
+UNRECOGNIZED_MSGS = [
+    "Hello world",
+    "Random text",
+    "Bot help me",
+    "What is this?"
+]
+
+EMPTY_MSGS = [None, "", "   ", "\n\t"]
+
+MIXED_CASE_MSGS = [
+    "BOT, MY NICK TESTTEAM",
+    "Bot, My Nick TestTeam",
+    "bot, my nick testteam"
+]
 
 
 class TestNLPProcessor:
     """Test cases for NLPProcessor class"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def nlp_processor(self):
         """Create NLP processor instance"""
-        return NLPProcessor()
+        return _NLP
     
-    def test_parse_team_name_russian(self, nlp_processor):
+    @pytest.mark.parametrize("message", RU_TEAM_NAME_MSGS)
+    def test_parse_team_name_russian(self, nlp_processor, message):
         """Test parsing Russian team name command"""
-        messages = [
-            "Бот, мой ник TestTeam",
-            "бот мой ник AwesomeTeam",
-            "Бот, команда SuperTeam"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "ru")
-            assert result is not None
-            assert result["type"] == "set_team_name"
-            assert len(result["team_name"]) > 0
+        result = nlp_processor.parse_message(message, "ru")
+        assert result is not None
+        assert result["type"] == "set_team_name"
+        assert len(result["team_name"]) > 0
     
-    def test_parse_team_name_english(self, nlp_processor):
+    @pytest.mark.parametrize("message", EN_TEAM_NAME_MSGS)
+    def test_parse_team_name_english(self, nlp_processor, message):
         """Test parsing English team name command"""
-        messages = [
-            "Bot, my nick TestTeam",
-            "bot my nickname AwesomeTeam",
-            "Bot, team name SuperTeam"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is not None
-            assert result["type"] == "set_team_name"
-            assert len(result["team_name"]) > 0
+        result = nlp_processor.parse_message(message, "en")
+        assert result is not None
+        assert result["type"] == "set_team_name"
+        assert len(result["team_name"]) > 0
     
-    def test_parse_vsa_rating_russian(self, nlp_processor):
+    @pytest.mark.parametrize("message", RU_VSA_RATING_MSGS)
+    def test_parse_vsa_rating_russian(self, nlp_processor, message):
         """Test parsing Russian VSA rating command"""
-        messages = [
-            "Бот, мой рекорд в VSA 42",
-            "бот мой рекорд в vsa 35",
-            "Бот, VSA рейтинг 50"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "ru")
-            assert result is not None
-            assert result["type"] == "set_vsa_rating"
-            assert isinstance(result["rating"], int)
-            assert result["rating"] > 0
-    
-    def test_parse_vsa_rating_english(self, nlp_processor):
+        result = nlp_processor.parse_message(message, "ru")
+        assert result is not None
+        assert result["type"] == "set_vsa_rating"
+        assert isinstance(result["rating"], int)
+        assert result["rating"] > 0
+    
+    @pytest.mark.parametrize("message", EN_VSA_RATING_MSGS)
+    def test_parse_vsa_rating_english(self, nlp_processor, message):
         """Test parsing English VSA rating command"""
-        messages = [
-            "Bot, my VSA rating 42",
-            "bot vsa 35",
-            "Bot, my VSA record 50"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is not None
-            assert result["type"] == "set_vsa_rating"
-            assert isinstance(result["rating"], int)
-            assert result["rating"] > 0
-    
-    def test_parse_h2h_rating_russian(self, nlp_processor):
+        result = nlp_processor.parse_message(message, "en")
+        assert result is not None
+        assert result["type"] == "set_vsa_rating"
+        assert isinstance(result["rating"], int)
+        assert result["rating"] > 0
+    
+    @pytest.mark.parametrize("message", RU_H2H_RATING_MSGS)
+    def test_parse_h2h_rating_russian(self, nlp_processor, message):
         """Test parsing Russian H2H rating command"""
-        messages = [
-            "Бот, мой рекорд в H2H 38",
-            "бот мой рекорд в h2h 45",
-            "Бот, H2H рейтинг 30"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "ru")
-            assert result is not None
-            assert result["type"] == "set_h2h_rating"
-            assert isinstance(result["rating"], int)
-            assert result["rating"] > 0
-    
-    def test_parse_h2h_rating_english(self, nlp_processor):
+        result = nlp_processor.parse_message(message, "ru")
+        assert result is not None
+        assert result["type"] == "set_h2h_rating"
+        assert isinstance(result["rating"], int)
+        assert result["rating"] > 0
+    
+    @pytest.mark.parametrize("message", EN_H2H_RATING_MSGS)
+    def test_parse_h2h_rating_english(self, nlp_processor, message):
         """Test parsing English H2H rating command"""
-        messages = [
-            "Bot, my H2H rating 38",
-            "bot h2h 45",
-            "Bot, my H2H record 30"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is not None
-            assert result["type"] == "set_h2h_rating"
-            assert isinstance(result["rating"], int)
-            assert result["rating"] > 0
-    
-    def test_parse_admin_confirm_russian(self, nlp_processor):
+        result = nlp_processor.parse_message(message, "en")
+        assert result is not None
+        assert result["type"] == "set_h2h_rating"
+        assert isinstance(result["rating"], int)
+        assert result["rating"] > 0
+    
+    @pytest.mark.parametrize("message", RU_ADMIN_CONFIRM_MSGS)
+    def test_parse_admin_confirm_russian(self, nlp_processor, message):
         """Test parsing Russian admin confirmation command"""
-        messages = [
-            "Бот @testuser +1",
-            "бот testuser +1",
-            "Бот, подтвердить testuser"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "ru")
-            assert result is not None
-            assert result["type"] == "admin_confirm"
-            assert result["username"] == "testuser"
+        result = nlp_processor.parse_message(message, "ru")
+        assert result is not None
+        assert result["type"] == "admin_confirm"
+        assert result["username"] == "testuser"
     
-    def test_parse_admin_confirm_english(self, nlp_processor):
+    @pytest.mark.parametrize("message", EN_ADMIN_CONFIRM_MSGS)
+    def test_parse_admin_confirm_english(self, nlp_processor, message):
         """Test parsing English admin confirmation command"""
-        messages = [
-            "Bot @testuser +1",
-            "bot testuser +1",
-            "Bot, confirm testuser"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is not None
-            assert result["type"] == "admin_confirm"
-            assert result["username"] == "testuser"
+        result = nlp_processor.parse_message(message, "en")
+        assert result is not None
+        assert result["type"] == "admin_confirm"
+        assert result["username"] == "testuser"
     
-    def test_parse_unrecognized_message(self, nlp_processor):
+    @pytest.mark.parametrize("message", UNRECOGNIZED_MSGS)
+    def test_parse_unrecognized_message(self, nlp_processor, message):
         """Test parsing unrecognized messages"""
-        messages = [
-            "Hello world",
-            "Random text",
-            "Bot help me",
-            "What is this?"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is None
+        result = nlp_processor.parse_message(message, "en")
+        assert result is None
     
-    def test_parse_empty_message(self, nlp_processor):
+    @pytest.mark.parametrize("message", EMPTY_MSGS)
+    def test_parse_empty_message(self, nlp_processor, message):
         """Test parsing empty or None messages"""
-        messages = [None, "", "   ", "\n\t"]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is None
+        result = nlp_processor.parse_message(message, "en")
+        assert result is None
     
-    def test_parse_case_insensitive(self, nlp_processor):
+    @pytest.mark.parametrize("message", MIXED_CASE_MSGS)
+    def test_parse_case_insensitive(self, nlp_processor, message):
         """Test that parsing is case insensitive"""
-        messages = [
-            "BOT, MY NICK TESTTEAM",
-            "Bot, My Nick TestTeam",
-            "bot, my nick testteam"
-        ]
-        
-        for message in messages:
-            result = nlp_processor.parse_message(message, "en")
-            assert result is not None
-            assert result["type"] == "set_team_name"
+        result = nlp_processor.parse_message(message, "en")
+        assert result is not None
+        assert result["type"] == "set_team_name"
     
     def test_validate_extracted_data(self, nlp_processor):
         """Test validation of extracted data"""
@@ -206,6 +211,18 @@ class TestNLPProcessor:
         assert any("vsa" in example.lower() for example in ru_examples)
         assert any("h2h" in example.lower() for example in ru_examples)
     
+    def test_parse_template(self, nlp_processor):
+        """Test that template fillers match a full parse"""
+        team_command = nlp_processor.parse_template("Bot, my nick Team{team}", "en")
+        rating_command = nlp_processor.parse_template("Бот, мой рекорд в VSA {rating}", "ru")
+        
+        for value in [1, 42, 99]:
+            assert team_command(team=value) == nlp_processor.parse_message(f"Bot, my nick Team{value}", "en")
+            assert rating_command(rating=value) == nlp_processor.parse_message(f"Бот, мой рекорд в VSA {value}", "ru")
+        
+        # Templates that do not parse into a command
+        assert nlp_processor.parse_template("Hello {name}", "en") is None
+    
     def test_language_fallback(self, nlp_processor):
         """Test language fallback mechanism"""
         # Use unsupported language, should fallback to English
@@ -214,6 +231,37 @@ class TestNLPProcessor:
         assert result["type"] == "set_team_name"
         assert result["team_name"] == "TestTeam"
 
+    
+    def test_get_processor_is_shared(self, nlp_processor):
+        """Test that the module-level processor is created only once"""
+        assert isinstance(nlp_processor, NLPProcessor)
+        assert get_processor() is nlp_processor
+
+    
+    def test_patterns_contain_trigger_word(self, nlp_processor):
+        """Test that the trigger pre-check cannot hide a matching pattern"""
+        for lang_patterns in nlp_processor.patterns.values():
+            for patterns in lang_patterns.values():
+                for pattern in patterns:
+                    assert any(word in pattern for word in _TRIGGER_WORDS), pattern
+
+
+    def test_repeated_message_returns_fresh_copy(self, nlp_processor):
+        """Test that cached parse results are not shared between callers"""
+        first = nlp_processor.parse_message("Bot, my VSA rating 42", "en")
+        first["rating"] = 0
+        second = nlp_processor.parse_message("Bot, my VSA rating 42", "en")
+        assert second == {"type": "set_vsa_rating", "rating": 42}
+        assert nlp_processor.parse_message("Bot, nothing to see", "en") is None
+        assert nlp_processor.parse_message("Bot, nothing to see", "en") is None
+
+    def test_uncached_parse_leaves_cache_untouched(self):
+        """Test that use_cache=False parses without touching the result cache"""
+        processor = NLPProcessor()
+        result = processor.parse_message("Bot, my H2H rating 38", "en", use_cache=False)
+        assert result == {"type": "set_h2h_rating", "rating": 38}
+        assert len(processor._results) == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,49 @@
+"""
+Unit tests for the outbound token bucket
+"""
+
+import pytest
+from unittest.mock import patch
+
+from bot.throttle import AsyncTokenBucket
+
+
+class TestAsyncTokenBucket:
+    """Test cases for AsyncTokenBucket class"""
+    
+    @pytest.fixture
+    def clock(self):
+        """Fake monotonic clock advanced by the patched asyncio.sleep"""
+        now = [100.0]
+        
+        async def fake_sleep(seconds):
+            now[0] += seconds
+        
+        with patch("bot.throttle.time.monotonic", side_effect=lambda: now[0]), \
+                patch("bot.throttle.asyncio.sleep", side_effect=fake_sleep):
+            yield now
+    
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self, clock):
+        """Test that a burst up to capacity is free and the rest is paced"""
+        bucket = AsyncTokenBucket(capacity=3, refill_rate=1)
+        
+        for _ in range(3):
+            await bucket.acquire()
+        assert clock[0] == 100.0
+        
+        await bucket.acquire()
+        assert clock[0] == pytest.approx(101.0)
+    
+    @pytest.mark.asyncio
+    async def test_pause_blocks_until_retry_after(self, clock):
+        """Test that pause drops tokens for the given duration"""
+        bucket = AsyncTokenBucket(capacity=30, refill_rate=30)
+        bucket.pause(5)
+        
+        await bucket.acquire()
+        assert clock[0] >= 105.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
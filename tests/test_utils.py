@@ -0,0 +1,32 @@
+"""
+Unit tests for bot utility helpers
+"""
+
+import pytest
+
+from bot.utils import split_message
+
+
+class TestSplitMessage:
+    """Test cases for split_message"""
+
+    def test_short_message_is_unchanged(self):
+        """Test that a message within the limit is sent as is"""
+        assert split_message("🏆 VSA\n✅ a: A (3 ⭐)", max_length=100) == ["🏆 VSA\n✅ a: A (3 ⭐)"]
+
+    def test_splits_on_line_boundaries(self):
+        """Test that parts end at newlines and stay within the limit"""
+        lines = [f"✅ player{i}: Team{i} (50 ⭐)" for i in range(200)]
+        parts = split_message("\n".join(lines), max_length=500)
+
+        assert len(parts) > 1
+        assert all(len(part) <= 500 for part in parts)
+        assert "\n".join(parts).split("\n") == lines
+
+    @pytest.mark.parametrize("max_length", [1, 3, 7])
+    def test_cuts_overlong_lines(self, max_length):
+        """Test that a single line longer than the limit is cut"""
+        parts = split_message("abcdefghij\nk", max_length=max_length)
+
+        assert all(len(part) <= max_length for part in parts)
+        assert "".join(parts).replace("\n", "") == "abcdefghijk"
@@ -5,19 +5,37 @@ Uses manual HTTP requests to avoid import issues
 """
 
 import asyncio
+import hmac
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-import requests
+import random
+import secrets
+from collections import deque
+from contextvars import ContextVar
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Tuple
+import aiohttp
+from aiohttp import web
 from dotenv import load_dotenv
 
-from bot.nlp import NLPProcessor
-from bot.storage import DataStorage
-from bot.localization import Localizer
+from bot.cache import TTLCache
+from bot.nlp import get_processor
+from bot.storage import DataStorage, tournament_label
+from bot.throttle import AsyncTokenBucket
+from bot.utils import run, split_message
+from bot.localization import Localizer, detect_language
 from bot.validation import ValidationError, validate_team_name, validate_rating
 
+# orjson encodes and parses API payloads much faster than the stdlib; fall
+# back to json when the optional speedups extra is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
 # Set up logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -28,6 +46,100 @@ logger = logging.getLogger(__name__)
 # Load environment
 load_dotenv()
 
+# Update kinds Telegram pushes to the webhook
+ALLOWED_UPDATES = ["message"]
+
+# Request bodies are sent as raw JSON rather than form-encoded
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# How many recent update IDs are remembered to drop re-deliveries
+SEEN_UPDATES_SIZE = 1024
+
+# Messages longer than this are parsed in a worker thread; shorter ones
+# parse faster than a thread handoff takes
+NLP_OFFLOAD_LENGTH = 512
+
+# Languages replies are localized to (see detect_language)
+BOT_LANGUAGES = ("ru", "en")
+
+# Localized texts without format parameters, looked up once per language
+STATIC_TEXT_KEYS = (
+    "unrecognized_command",
+    "admin_only",
+    "processing_error",
+    "team_name_required",
+    "next_step_rating",
+    "awaiting_confirmation",
+    "list_vsa_header",
+    "list_h2h_header",
+    "list_pending_header",
+    "list_empty",
+)
+
+# setWebhook retry backoff bounds in seconds
+INITIAL_BACKOFF = 0.5
+MAX_BACKOFF = 30
+
+
+# Reply held back for the webhook HTTP response of the update being handled.
+# None outside a webhook request; otherwise a list with at most one payload.
+_webhook_reply: ContextVar[Optional[List[Dict]]] = ContextVar("webhook_reply", default=None)
+
+
+class TelegramAPIError(Exception):
+    """Non-success HTTP status from the Telegram Bot API"""
+    
+    def __init__(self, status: int, description: str = ""):
+        super().__init__(f"Telegram API returned {status}: {description}")
+        self.status = status
+
+
+def dumps_json(value: Any) -> bytes:
+    """Serialize a value to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Row templates for the admin /list output
+_PLAYER_ROW = "{status} {username}: {name} ({stars} ⭐)".format
+_PENDING_ROW = "• @{username} - {tournament}: {team_name} ({rating} ⭐)".format
+_player_fields = itemgetter("confirmed", "name", "stars")
+
+# Admin confirmation reply
+_CONFIRMED_TEXT = "✅ Registration confirmed for @{username} in {tournament}: {team_name}".format
+
+
+def render_tournament(title: str, tournament_players: Dict[str, Dict], empty_text: str = "No registrations") -> str:
+    """
+    Render one tournament section of the admin player list
+    
+    Args:
+        title: Section heading
+        tournament_players: Lowercase username -> player data for the tournament;
+            rows show the username as registered
+        empty_text: Shown after the heading when nobody is registered
+        
+    Returns:
+        Heading followed by one row per player
+    """
+    if not tournament_players:
+        return f"{title} {empty_text}"
+    
+    rows = "\n".join(
+        _PLAYER_ROW(
+            status="✅" if confirmed else "⏳",
+            username=player.get("username", username),
+            name=name,
+            stars=stars
+        )
+        for (username, player), (confirmed, name, stars) in zip(
+            tournament_players.items(), map(_player_fields, tournament_players.values())
+        )
+    )
+    return f"{title}\n{rows}"
+
+
 class ManualTelegramBot:
     """Manual implementation using direct Telegram API calls"""
     
@@ -35,76 +147,236 @@ class ManualTelegramBot:
         self.token = os.getenv('BOT_TOKEN')
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         self.admins = [admin.strip() for admin in os.getenv('ADMINS', '').split(',') if admin.strip()]
+        self.admin_set = frozenset(admin.lower() for admin in self.admins)
+        
+        # Public HTTPS base URL Telegram posts updates to, and the local listener
+        self.webhook_url = os.getenv('WEBHOOK_URL', '').rstrip('/')
+        self.webhook_secret = os.getenv('WEBHOOK_SECRET') or secrets.token_urlsafe(32)
+        self.webhook_host = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+        self.webhook_port = int(os.getenv('WEBHOOK_PORT', '8080'))
         
         # Initialize components
         self.storage = DataStorage()
         self.localizer = Localizer()
-        self.nlp = NLPProcessor()
+        self.nlp = get_processor()
+        
+        # (key, lang) -> localized text for the parameterless replies
+        get_text = self.localizer.get_text
+        self._static_texts = {
+            (key, lang): get_text(key, lang)
+            for key in STATIC_TEXT_KEYS
+            for lang in BOT_LANGUAGES
+        }
+        
+        # /start and /help replies, joined once per language
+        self._welcome = {
+            lang: f"{get_text('welcome_message', lang)}\n\n{get_text('instructions', lang)}"
+            for lang in BOT_LANGUAGES
+        }
+        self._help = {
+            lang: f"{get_text('help_message', lang)}\n\n{get_text('command_examples', lang)}"
+            for lang in BOT_LANGUAGES
+        }
+        
+        # In-memory user context storage; idle contexts expire after an hour
+        self.user_contexts = TTLCache(maxsize=10_000, ttl=3600)
+        
+        # Keep-alive HTTP session for the Telegram API, opened in run()
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Bound how many updates are handled at once
+        self.handler_semaphore = asyncio.Semaphore(32)
         
-        # In-memory user context storage
-        self.user_contexts = {}
+        # Outbound pacing: ~30 messages/s overall and 1 message/s per chat
+        self.global_bucket = AsyncTokenBucket(capacity=30, refill_rate=30)
+        self.chat_buckets = TTLCache(maxsize=10_000, ttl=60)
+        
+        # Per language: last rendered /list parts and the storage version they reflect
+        self._list_cache: Dict[str, Tuple[int, List[str]]] = {}
+        
+        # Recently handled update IDs, oldest first (see is_duplicate_update)
+        self._seen_updates = deque(maxlen=SEEN_UPDATES_SIZE)
+        self._seen_update_ids = set()
         
         logger.info("Manual Tournament Bot initialized")
     
     def is_admin(self, username: str) -> bool:
         """Check if user is admin"""
-        if not username:
-            return False
-        return username.lower() in [admin.lower() for admin in self.admins]
+        return bool(username) and username.lower() in self.admin_set
+    
+    def is_duplicate_update(self, update_id: int) -> bool:
+        """
+        Check whether an update was already handled and remember it if not
+        
+        Args:
+            update_id: Telegram update ID
+            
+        Returns:
+            True if the update was seen recently and should be skipped
+        """
+        if update_id in self._seen_update_ids:
+            return True
+        if len(self._seen_updates) == self._seen_updates.maxlen:
+            self._seen_update_ids.discard(self._seen_updates[0])
+        self._seen_updates.append(update_id)
+        self._seen_update_ids.add(update_id)
+        return False
     
-    def send_message(self, chat_id: int, text: str, parse_mode: str = None) -> bool:
-        """Send message via Telegram API"""
+    def chat_bucket(self, chat_id: int) -> AsyncTokenBucket:
+        """Get the send rate limiter for a chat"""
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = AsyncTokenBucket(capacity=1, refill_rate=1)
+        return bucket
+    
+    async def send_message(self, chat_id: int, text: str, parse_mode: str = None) -> bool:
+        """
+        Send message via Telegram API
+        
+        While a webhook request is being handled, the latest reply is held
+        back and returned in the HTTP response instead of being posted (see
+        handle_webhook). Its delivery result is unknown, so True is returned.
+        """
+        data = {
+            "chat_id": chat_id,
+            "text": text[:4000],  # Telegram message limit
+        }
+        if parse_mode:
+            data["parse_mode"] = parse_mode
+        
+        slot = _webhook_reply.get()
+        if slot is None:
+            return await self._post_message(data)
+        
+        # Only one reply fits in the response; post the held one first to keep order.
+        # Rate limit tokens are taken when a message actually leaves
+        if slot:
+            await self._post_message(slot.pop())
+        slot.append(data)
+        return True
+    
+    async def _acquire_send(self, chat_id: int) -> None:
+        """Wait for Telegram's global and per-chat send limits"""
+        await self.global_bucket.acquire()
+        await self.chat_bucket(chat_id).acquire()
+    
+    async def _post_message(self, data: Dict) -> bool:
+        """Post a sendMessage payload, honouring the send rate limits"""
         try:
             url = f"{self.base_url}/sendMessage"
-            data = {
-                "chat_id": chat_id,
-                "text": text[:4000],  # Telegram message limit
-            }
-            if parse_mode:
-                data["parse_mode"] = parse_mode
+            body = dumps_json(data)
             
-            response = requests.post(url, data=data)
-            return response.status_code == 200
+            for attempt in range(2):
+                await self._acquire_send(data["chat_id"])
+                
+                async with self.session.post(url, data=body, headers=JSON_HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status != 429:
+                        return response.status == 200
+                    payload = json_loads(await response.read())
+                
+                # Flood control: hold all sends for retry_after, then retry once
+                retry_after = payload.get("parameters", {}).get("retry_after", 1)
+                logger.warning("Telegram rate limit hit, pausing sends for %ss", retry_after)
+                self.global_bucket.pause(retry_after)
+            return False
         except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+            logger.error("Failed to send message: %s", e)
             return False
     
-    def get_updates(self, offset: int = 0) -> List[Dict]:
-        """Get updates from Telegram"""
-        try:
-            url = f"{self.base_url}/getUpdates"
-            params = {"offset": offset, "timeout": 10}
-            response = requests.get(url, params=params)
+    async def set_webhook(self) -> None:
+        """
+        Register the webhook URL and secret with Telegram
+        
+        Transient failures are retried with backoff.
+        
+        Raises:
+            TelegramAPIError: If Telegram rejects the webhook settings
+        """
+        url = f"{self.base_url}/setWebhook"
+        body = dumps_json({
+            "url": f"{self.webhook_url}/webhook/{self.webhook_secret}",
+            "secret_token": self.webhook_secret,
+            "allowed_updates": ALLOWED_UPDATES
+        })
+        backoff = INITIAL_BACKOFF
+        
+        while True:
+            try:
+                async with self.session.post(url, data=body, headers=JSON_HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status == 200:
+                        logger.info("Webhook registered")
+                        return
+                    raise TelegramAPIError(response.status, await response.text())
+            except TelegramAPIError as e:
+                if 400 <= e.status < 500 and e.status != 429:
+                    raise
+                logger.error("Failed to set webhook: %s", e)
+            except Exception as e:
+                logger.error("Failed to set webhook: %s", e)
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("result", [])
-            return []
+            await self._backoff(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+    
+    async def handle_webhook(self, request: web.Request) -> web.Response:
+        """
+        Handle an update pushed by Telegram
+        
+        The last reply produced for the update is returned as the response
+        body, which Telegram executes as a sendMessage call.
+        """
+        secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(secret, self.webhook_secret):
+            return web.Response(status=403)
+        
+        try:
+            update = json_loads(await request.read())
+        except ValueError:
+            return web.Response(status=400)
+        
+        # Telegram re-posts updates it considers undelivered
+        if self.is_duplicate_update(update.get("update_id")):
+            return web.Response()
+        
+        slot: List[Dict] = []
+        token = _webhook_reply.set(slot)
+        try:
+            await self.handle_update(update)
         except Exception as e:
-            logger.error(f"Failed to get updates: {e}")
-            return []
+            logger.error("Error handling update: %s", e)
+        finally:
+            _webhook_reply.reset(token)
+        
+        if not slot:
+            return web.Response()
+        await self._acquire_send(slot[0]["chat_id"])
+        return web.Response(
+            body=dumps_json({"method": "sendMessage", **slot[0]}),
+            content_type="application/json"
+        )
     
     async def handle_update(self, update: Dict) -> None:
         """Process a single update"""
+        async with self.handler_semaphore:
+            await self._handle_update(update)
+    
+    async def _handle_update(self, update: Dict) -> None:
+        """Parse an update and route it to the command or NLP handlers"""
         try:
             message = update.get("message")
             if not message:
                 return
             
-            chat_id = message["chat"]["id"]
-            user = message.get("from", {})
-            username = user.get("username", "")
-            user_id = user.get("id")
-            text = message.get("text", "")
-            
+            text = message.get("text")
             if not text:
                 return
             
-            # Determine language
-            lang_code = user.get("language_code", "en")
-            lang = "ru" if lang_code and lang_code.startswith("ru") else "en"
+            chat_id = message["chat"]["id"]
+            user = message.get("from") or {}
+            username = user.get("username", "")
+            user_id = user.get("id")
+            lang = detect_language(user.get("language_code"))
             
-            logger.info(f"Processing message from @{username}: {text}")
+            logger.info("Processing message from @%s: %s", username, text)
             
             # Handle commands
             if text.startswith("/"):
@@ -113,21 +385,17 @@ class ManualTelegramBot:
                 await self.handle_natural_language(chat_id, user_id, username, text, lang)
                 
         except Exception as e:
-            logger.error(f"Error handling update: {e}")
+            logger.error("Error handling update: %s", e)
     
     async def handle_command(self, chat_id: int, user_id: int, username: str, text: str, lang: str):
         """Handle slash commands"""
         command = text.split()[0].lower()
         
         if command == "/start":
-            welcome_text = self.localizer.get_text("welcome_message", lang)
-            instructions_text = self.localizer.get_text("instructions", lang)
-            self.send_message(chat_id, f"{welcome_text}\n\n{instructions_text}", "HTML")
+            await self.send_message(chat_id, self._welcome[lang], "HTML")
             
         elif command == "/help":
-            help_text = self.localizer.get_text("help_message", lang)
-            examples_text = self.localizer.get_text("command_examples", lang)
-            self.send_message(chat_id, f"{help_text}\n\n{examples_text}", "HTML")
+            await self.send_message(chat_id, self._help[lang], "HTML")
             
         elif command == "/list":
             await self.handle_list_command(chat_id, username, lang)
@@ -136,64 +404,61 @@ class ManualTelegramBot:
             await self.handle_stats_command(chat_id, username, lang)
             
         else:
-            help_text = self.localizer.get_text("unrecognized_command", lang)
-            self.send_message(chat_id, help_text)
+            help_text = self._static_texts["unrecognized_command", lang]
+            await self.send_message(chat_id, help_text)
     
     async def handle_list_command(self, chat_id: int, username: str, lang: str):
         """Handle /list command"""
         if not self.is_admin(username):
-            error_text = self.localizer.get_text("admin_only", lang)
-            self.send_message(chat_id, error_text)
+            error_text = self._static_texts["admin_only", lang]
+            await self.send_message(chat_id, error_text)
             return
         
-        players = self.storage.get_all_players()
-        temp_registrations = self.storage.get_temp_registrations()
-        
-        message_parts = []
+        version = self.storage.version
+        cached = self._list_cache.get(lang)
+        if cached is None or cached[0] != version:
+            cached = self._list_cache[lang] = (version, split_message(self.render_player_list(lang)))
         
-        # VSA Tournament
-        vsa_players = players.get("vsa", {})
-        if vsa_players:
-            message_parts.append("🏆 <b>VSA Tournament:</b>")
-            for username_key, data in vsa_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username_key}: {data['name']} ({data['stars']} ⭐)")
-        else:
-            message_parts.append("🏆 <b>VSA Tournament:</b> No registrations")
+        # Long lists go out as several messages, in order
+        for part in cached[1]:
+            await self.send_message(chat_id, part, "HTML")
         
-        message_parts.append("")
+        logger.info("Admin @%s requested player list", username)
+    
+    def render_player_list(self, lang: str = "en") -> str:
+        """Render the admin player list with pending confirmations"""
+        players = self.storage.get_all_players()
+        temp_registrations = self.storage.get_temp_registrations()
+        texts = self._static_texts
+        empty_text = texts["list_empty", lang]
         
-        # H2H Tournament
-        h2h_players = players.get("h2h", {})
-        if h2h_players:
-            message_parts.append("⚔️ <b>H2H Tournament:</b>")
-            for username_key, data in h2h_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username_key}: {data['name']} ({data['stars']} ⭐)")
-        else:
-            message_parts.append("⚔️ <b>H2H Tournament:</b> No registrations")
+        sections = [
+            render_tournament(texts["list_vsa_header", lang], players.get("vsa", {}), empty_text),
+            "",
+            render_tournament(texts["list_h2h_header", lang], players.get("h2h", {}), empty_text)
+        ]
         
         # Pending confirmations
         if temp_registrations:
-            message_parts.append("")
-            message_parts.append("⏳ <b>Pending Confirmations:</b>")
-            for user_id, data in temp_registrations.items():
-                username_temp = data.get("username", "Unknown")
-                tournament = data.get("tournament_type", "unknown").upper()
-                team_name = data.get("team_name", "Unknown")
-                rating = data.get("rating", 0)
-                message_parts.append(f"• @{username_temp} - {tournament}: {team_name} ({rating} ⭐)")
-        
-        final_message = "\n".join(message_parts) if message_parts else "No registrations found"
-        self.send_message(chat_id, final_message, "HTML")
-        
-        logger.info(f"Admin @{username} requested player list")
+            sections.append("")
+            sections.append(texts["list_pending_header", lang])
+            sections.append("\n".join(
+                _PENDING_ROW(
+                    username=data.get("username", "Unknown"),
+                    tournament=tournament_label(data.get("tournament_type", "unknown")),
+                    team_name=data.get("team_name", "Unknown"),
+                    rating=data.get("rating", 0)
+                )
+                for data in temp_registrations.values()
+            ))
+        
+        return "\n".join(sections)
     
     async def handle_stats_command(self, chat_id: int, username: str, lang: str):
         """Handle /stats command"""
         if not self.is_admin(username):
-            error_text = self.localizer.get_text("admin_only", lang)
-            self.send_message(chat_id, error_text)
+            error_text = self._static_texts["admin_only", lang]
+            await self.send_message(chat_id, error_text)
             return
         
         stats = self.storage.get_statistics()
@@ -209,17 +474,21 @@ class ManualTelegramBot:
             f"🕐 Last Registration: {stats['last_registration_time'] or 'Never'}"
         ]
         
-        self.send_message(chat_id, "\n".join(message_parts), "HTML")
-        logger.info(f"Admin @{username} requested statistics")
+        await self.send_message(chat_id, "\n".join(message_parts), "HTML")
+        logger.info("Admin @%s requested statistics", username)
     
     async def handle_natural_language(self, chat_id: int, user_id: int, username: str, text: str, lang: str):
         """Handle natural language messages"""
         try:
-            parsed_command = self.nlp.parse_message(text, lang)
+            if len(text) > NLP_OFFLOAD_LENGTH:
+                # Off the loop thread, so keep away from the unlocked result cache
+                parsed_command = await asyncio.to_thread(self.nlp.parse_message, text, lang, False)
+            else:
+                parsed_command = self.nlp.parse_message(text, lang)
             
             if not parsed_command:
-                help_text = self.localizer.get_text("unrecognized_command", lang)
-                self.send_message(chat_id, help_text)
+                help_text = self._static_texts["unrecognized_command", lang]
+                await self.send_message(chat_id, help_text)
                 return
             
             command_type = parsed_command.get("type")
@@ -237,9 +506,9 @@ class ManualTelegramBot:
                 await self.handle_admin_confirm(chat_id, username, parsed_command["username"], lang)
                 
         except Exception as e:
-            logger.error(f"Error processing natural language: {e}")
-            error_text = self.localizer.get_text("processing_error", lang)
-            self.send_message(chat_id, error_text)
+            logger.error("Error processing natural language: %s", e)
+            error_text = self._static_texts["processing_error", lang]
+            await self.send_message(chat_id, error_text)
     
     async def handle_team_name(self, chat_id: int, user_id: int, username: str, team_name: str, lang: str):
         """Handle team name setting"""
@@ -247,21 +516,17 @@ class ManualTelegramBot:
             validate_team_name(team_name)
             
             # Store in user context
-            if user_id not in self.user_contexts:
-                self.user_contexts[user_id] = {}
-            
-            self.user_contexts[user_id]["team_name"] = team_name
-            self.user_contexts[user_id]["timestamp"] = datetime.now()
+            self.user_contexts.setdefault(user_id, {})["team_name"] = team_name
             
-            success_text = self.localizer.get_text("team_name_saved", lang).format(team_name=team_name)
-            next_step_text = self.localizer.get_text("next_step_rating", lang)
+            success_text = self.localizer.get_text("team_name_saved", lang, team_name=team_name)
+            next_step_text = self._static_texts["next_step_rating", lang]
             
-            self.send_message(chat_id, f"{success_text}\n\n{next_step_text}")
-            logger.info(f"User @{username} set team name: {team_name}")
+            await self.send_message(chat_id, f"{success_text}\n\n{next_step_text}")
+            logger.info("User @%s set team name: %s", username, team_name)
             
         except ValidationError as e:
-            error_text = self.localizer.get_text("validation_error", lang).format(error=str(e))
-            self.send_message(chat_id, error_text)
+            error_text = self.localizer.get_text("validation_error", lang, error=str(e))
+            await self.send_message(chat_id, error_text)
     
     async def handle_rating(self, chat_id: int, user_id: int, username: str, tournament_type: str, rating: int, lang: str):
         """Handle rating setting"""
@@ -270,8 +535,8 @@ class ManualTelegramBot:
             
             user_context = self.user_contexts.get(user_id, {})
             if "team_name" not in user_context:
-                error_text = self.localizer.get_text("team_name_required", lang)
-                self.send_message(chat_id, error_text)
+                error_text = self._static_texts["team_name_required", lang]
+                await self.send_message(chat_id, error_text)
                 return
             
             team_name = user_context["team_name"]
@@ -285,82 +550,95 @@ class ManualTelegramBot:
             )
             
             if success:
-                success_text = self.localizer.get_text("rating_saved", lang).format(
-                    tournament=tournament_type.upper(),
+                success_text = self.localizer.get_text(
+                    "rating_saved",
+                    lang,
+                    tournament=tournament_label(tournament_type),
                     rating=rating
                 )
-                confirm_text = self.localizer.get_text("awaiting_confirmation", lang)
-                self.send_message(chat_id, f"{success_text}\n\n{confirm_text}")
-                logger.info(f"User @{username} registered for {tournament_type}: {rating}")
+                confirm_text = self._static_texts["awaiting_confirmation", lang]
+                await self.send_message(chat_id, f"{success_text}\n\n{confirm_text}")
+                logger.info("User @%s registered for %s: %s", username, tournament_type, rating)
             else:
                 error_text = "Registration failed. You may already be registered for this tournament."
-                self.send_message(chat_id, error_text)
+                await self.send_message(chat_id, error_text)
                 
         except ValidationError as e:
-            error_text = self.localizer.get_text("validation_error", lang).format(error=str(e))
-            self.send_message(chat_id, error_text)
+            error_text = self.localizer.get_text("validation_error", lang, error=str(e))
+            await self.send_message(chat_id, error_text)
     
     async def handle_admin_confirm(self, chat_id: int, username: str, target_username: str, lang: str):
         """Handle admin confirmation"""
         if not self.is_admin(username):
-            error_text = self.localizer.get_text("admin_only", lang)
-            self.send_message(chat_id, error_text)
+            error_text = self._static_texts["admin_only", lang]
+            await self.send_message(chat_id, error_text)
             return
         
-        temp_registrations = self.storage.get_temp_registrations()
-        target_data = None
-        target_user_id = None
-        
-        for user_id, data in temp_registrations.items():
-            if data.get("username", "").lower() == target_username.lower():
-                target_data = data
-                target_user_id = user_id
-                break
-        
-        if not target_data:
+        # Username index lookup instead of scanning every pending registration
+        matches = self.storage.find_temp_registrations(target_username)
+        if not matches:
             error_text = f"No pending registration found for @{target_username}"
-            self.send_message(chat_id, error_text)
+            await self.send_message(chat_id, error_text)
             return
         
-        success = self.storage.confirm_registration(target_user_id)
+        target_user_id, target_data = matches[0]
+        success = await self.storage.confirm_registration_async(target_user_id)
         
         if success:
-            success_text = f"✅ Registration confirmed for @{target_username} in {target_data['tournament_type'].upper()}: {target_data['team_name']}"
-            self.send_message(chat_id, success_text)
-            logger.info(f"Admin @{username} confirmed registration for @{target_username}")
+            success_text = _CONFIRMED_TEXT(
+                username=target_username,
+                tournament=tournament_label(target_data["tournament_type"]),
+                team_name=target_data["team_name"]
+            )
+            await self.send_message(chat_id, success_text)
+            logger.info("Admin @%s confirmed registration for @%s", username, target_username)
         else:
-            self.send_message(chat_id, "Failed to confirm registration.")
+            await self.send_message(chat_id, "Failed to confirm registration.")
+    
+    @staticmethod
+    async def _backoff(backoff: float) -> None:
+        """Sleep a random time up to the current backoff (full jitter)"""
+        delay = random.uniform(0, backoff)
+        logger.info("Retrying in %.1fs", delay)
+        await asyncio.sleep(delay)
     
     async def run(self):
-        """Main bot loop"""
+        """Serve the webhook until cancelled"""
         if not self.token:
             logger.error("BOT_TOKEN not found in environment variables")
             return
+        if not self.webhook_url:
+            logger.error("WEBHOOK_URL not found in environment variables")
+            return
         
-        logger.info("Starting Manual Tournament Bot with polling...")
+        logger.info("Starting Manual Tournament Bot with webhook...")
         
-        offset = 0
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=75)
+        )
         
         # Start periodic cleanup
-        asyncio.create_task(self.storage.periodic_cleanup())
+        self.storage.start_cleanup()
         
-        while True:
-            try:
-                updates = self.get_updates(offset)
-                
-                for update in updates:
-                    await self.handle_update(update)
-                    offset = update["update_id"] + 1
-                
-                if not updates:
-                    await asyncio.sleep(1)  # Brief pause when no updates
-                    
-            except KeyboardInterrupt:
-                logger.info("Bot stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
+        # Coalesce registration saves into one file write per 100 ms
+        self.storage.start_flusher(interval=0.1, threshold=64)
+        
+        app = web.Application()
+        app.router.add_post(f"/webhook/{self.webhook_secret}", self.handle_webhook)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        
+        try:
+            await web.TCPSite(runner, self.webhook_host, self.webhook_port).start()
+            logger.info("Listening for updates on %s:%s", self.webhook_host, self.webhook_port)
+            
+            await self.set_webhook()
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+            await self.storage.stop_cleanup()
+            await self.storage.stop_flusher()
+            await self.session.close()
 
 async def main():
     """Main entry point"""
@@ -368,7 +646,7 @@ async def main():
         bot = ManualTelegramBot()
         await bot.run()
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main)
\ No newline at end of file
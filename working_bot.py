@@ -5,11 +5,14 @@ Working Tournament Bot - Исправленная версия без ошибо
 """
 
 import asyncio
+import functools
 import logging
 import os
-import json
-from datetime import datetime
-from typing import Dict, Any
+import re
+import time
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Any, Optional
 
 # Настройка логирования
 logging.basicConfig(
@@ -23,168 +26,282 @@ try:
     from telegram import Update
     TELEGRAM_AVAILABLE = True
 except ImportError as e:
-    logger.warning(f"Ошибка импорта Telegram: {e}")
+    logger.warning("Ошибка импорта Telegram: %s", e)
     TELEGRAM_AVAILABLE = False
 
 from dotenv import load_dotenv
-from bot.nlp import NLPProcessor
-from bot.storage import DataStorage
-from bot.localization import Localizer
+from bot.cache import TTLCache
+from bot.nlp import get_processor
+from bot.storage import DataStorage, tournament_label
+from bot.localization import Localizer, detect_language
+from bot.utils import run, split_message
 from bot.validation import ValidationError, validate_team_name, validate_rating
 
 # Загрузка переменных окружения
 load_dotenv()
 
+# Упоминание пользователя в сообщении, на которое отвечает админ
+_MENTION_RE = re.compile(r'@(\w+)')
+
+# Ответ админа, означающий подтверждение ("да" только отдельным словом)
+_CONFIRM_RE = re.compile(r'подтвер(?:дить|ждаю)|\bда\b', re.IGNORECASE)
+
+# Сколько секунд доверяем закэшированному статусу администратора
+ADMIN_CACHE_TTL = 60
+
+# Поля игрока для строки в /list
+_player_fields = itemgetter("confirmed", "name", "stars")
+
+# Значки статуса и заголовки турниров для /list
+_OK = "✅"
+_WAIT = "⏳"
+_VSA_HEADER = "🏆 VSA Турнир:"
+_H2H_HEADER = "⚔️ H2H Турнир:"
+_VSA_EMPTY = "🏆 VSA Турнир: Нет регистраций"
+_H2H_EMPTY = "⚔️ H2H Турнир: Нет регистраций"
+_LIST_SECTIONS = (("vsa", _VSA_HEADER, _VSA_EMPTY), ("h2h", _H2H_HEADER, _H2H_EMPTY))
+
+# Языки, для которых тексты собираются заранее
+BOT_LANGUAGES = ("ru", "en")
+
+# Справка /help для обычных пользователей
+_HELP_USER_RU = (
+    "❓ Как зарегистрироваться на турнир:\n\n"
+    "1️⃣ Сначала укажите название команды:\n"
+    "• Бот, мой ник НазваниеКоманды\n\n"
+    "2️⃣ Затем укажите рейтинг для турнира:\n"
+    "• Бот, мой рекорд в VSA 99\n"
+    "• Бот, мой рекорд в H2H 99\n\n"
+    "📝 Примеры команд:\n"
+    "• Бот, мой ник SuperTeam\n"
+    "• Бот, мой рекорд в VSA 85\n"
+    "• Бот, мой рекорд в H2H 78\n\n"
+    "⚠️ После регистрации ожидайте подтверждения от администратора."
+)
+
+# Список команд администратора (/command)
+_ADMIN_COMMANDS_RU = (
+    "🎮 Команды администратора:\n\n"
+    "/start - Запуск бота\n"
+    "/help - Помощь\n"
+    "/list - Список всех игроков\n"
+    "/stats - Статистика турнира\n"
+    "/clear confirm - Очистить все данные\n"
+    "/command - Показать эту справку\n\n"
+    "📝 Для подтверждения регистрации:\n"
+    "Напишите: 'подтвердить @username'"
+)
+
+# Ответ администратору после подтверждения регистрации
+_CONFIRMED_RU = "✅ Регистрация подтверждена для @{username} в {tournament}: {team_name}".format
+
+# Подсказка /clear без подтверждения
+_CLEAR_CONFIRM_HELP_RU = (
+    "⚠️ Для очистки данных используйте: /clear confirm\n"
+    "Это действие необратимо!"
+)
+
+# Ответ на нераспознанное сообщение
+_UNKNOWN_COMMAND_RU = (
+    "❓ Не понял команду. Используйте:\n\n"
+    "🔸 Бот, мой ник НазваниеКоманды\n"
+    "🔸 Бот, мой рекорд в VSA 99\n"
+    "🔸 Бот, мой рекорд в H2H 99\n\n"
+    "Или отправьте /help для подробной справки."
+)
+
+
+@dataclass(slots=True)
+class RegistrationDraft:
+    """Незавершённая регистрация пользователя в context.user_data"""
+    team_name: Optional[str] = None
+    timestamp: float = 0.0
+
+
+def _pending_line(data) -> str:
+    """Строка /list для ожидающей подтверждения регистрации"""
+    get = data.get
+    label = tournament_label(get("tournament_type", "unknown"))
+    return f"• @{get('username', 'Неизвестный')} - {label}: {get('team_name', 'Неизвестно')} ({get('rating', 0)} ⭐)"
+
+
+def admin_required(handler):
+    """
+    Пропускает вызов обработчика только для администраторов чата
+    
+    Остальным отвечает текстом admin_only на их языке.
+    """
+    @functools.wraps(handler)
+    async def wrapper(self, update, context, *args, **kwargs):
+        if not await self.is_admin(update, context):
+            await update.message.reply_text(self._admin_only[self._lang(update.effective_user)])
+            return
+        return await handler(self, update, context, *args, **kwargs)
+    
+    return wrapper
+
+
 class WorkingTournamentBot:
     """Исправленный турнирный бот"""
     
     def __init__(self):
         self.token = os.getenv('BOT_TOKEN')
-        self.admins = [admin.strip().lower() for admin in os.getenv('ADMINS', '').split(',') if admin.strip()]
+        self.admins = frozenset(admin.strip().lower() for admin in os.getenv('ADMINS', '').split(',') if admin.strip())
         
         # Инициализация компонентов
         self.storage = DataStorage()
         self.localizer = Localizer()
-        self.nlp = NLPProcessor()
+        self.nlp = get_processor()
+        
+        # Готовые тексты ответов для каждого языка, собираются один раз
+        get_text = self.localizer.get_text
+        self._welcome = {
+            lang: f"{get_text('welcome_message', lang)}\n\n{get_text('instructions', lang)}"
+            for lang in BOT_LANGUAGES
+        }
+        self._help = {
+            lang: f"{get_text('help_message', lang)}\n\n{get_text('command_examples', lang)}"
+            for lang in BOT_LANGUAGES
+        }
+        self._admin_only = {lang: get_text("admin_only", lang) for lang in BOT_LANGUAGES}
+        self._processing_error = {lang: get_text("processing_error", lang) for lang in BOT_LANGUAGES}
+        self._team_name_required = {lang: get_text("team_name_required", lang) for lang in BOT_LANGUAGES}
+        self._next_step_rating = {lang: get_text("next_step_rating", lang) for lang in BOT_LANGUAGES}
+        self._awaiting_confirmation = {lang: get_text("awaiting_confirmation", lang) for lang in BOT_LANGUAGES}
+        
+        # (chat_id, user_id) -> (время проверки, является ли админом)
+        self._admin_cache = TTLCache(maxsize=1024, ttl=ADMIN_CACHE_TTL)
+        
+        # Последний ответ на /list и версия хранилища, по которой он собран
+        self._list_cache = None
+        
+        # Тип NLP команды -> (поле с аргументом, обработчик)
+        self._nlp_dispatch = {
+            "set_team_name": ("team_name", self.handle_team_name),
+            "set_vsa_rating": (
+                "rating",
+                lambda update, context, rating, lang: self.handle_rating(update, context, "vsa", rating, lang),
+            ),
+            "set_h2h_rating": (
+                "rating",
+                lambda update, context, rating, lang: self.handle_rating(update, context, "h2h", rating, lang),
+            ),
+            "admin_confirm": ("username", self.handle_admin_confirm),
+        }
         
         logger.info("Компоненты турнирного бота инициализированы")
     
+    @staticmethod
+    def _display_name(user) -> str:
+        """Имя пользователя для логов и регистраций"""
+        return user.username or user.first_name or "Unknown"
+    
+    @staticmethod
+    def _lang(user) -> str:
+        """Язык ответов для пользователя"""
+        return detect_language(user.language_code)
+    
     async def is_admin(self, update, context) -> bool:
         """Проверка является ли пользователь администратором чата"""
         try:
             user = update.effective_user
             chat = update.effective_chat
             
+            # Повторные проверки в течение ADMIN_CACHE_TTL не ходят в Telegram API
+            key = (chat.id, user.id)
+            now = time.monotonic()
+            cached = self._admin_cache.get(key)
+            if cached is not None and now - cached[0] < ADMIN_CACHE_TTL:
+                return cached[1]
+            
             # Проверяем статус пользователя в чате
             member = await context.bot.get_chat_member(chat.id, user.id)
             
             # Администраторы и создатели чата имеют права
-            return member.status in ['administrator', 'creator']
+            result = member.status in ['administrator', 'creator']
+            self._admin_cache[key] = (now, result)
+            return result
         except Exception as e:
-            logger.error(f"Ошибка при проверке прав администратора: {e}")
+            logger.error("Ошибка при проверке прав администратора: %s", e)
             return False
     
     async def handle_start(self, update, context):
         """Обработка команды /start"""
         user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
-        
-        welcome_text = self.localizer.get_text("welcome_message", lang)
-        instructions_text = self.localizer.get_text("instructions", lang)
+        lang = self._lang(user)
         
-        await update.message.reply_text(f"{welcome_text}\n\n{instructions_text}")
+        await update.message.reply_text(self._welcome[lang])
         
-        logger.info(f"Пользователь {user.username or user.first_name or 'Unknown'} запустил бота")
+        logger.info("Пользователь %s запустил бота", self._display_name(user))
     
     async def handle_help(self, update, context):
         """Обработка команды /help"""
         user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
+        lang = self._lang(user)
         
         if await self.is_admin(update, context):
-            help_text = self.localizer.get_text("help_message", lang)
-            examples_text = self.localizer.get_text("command_examples", lang)
-            await update.message.reply_text(f"{help_text}\n\n{examples_text}")
+            await update.message.reply_text(self._help[lang])
         else:
-            help_text = (
-                "❓ Как зарегистрироваться на турнир:\n\n"
-                "1️⃣ Сначала укажите название команды:\n"
-                "• Бот, мой ник НазваниеКоманды\n\n"
-                "2️⃣ Затем укажите рейтинг для турнира:\n"
-                "• Бот, мой рекорд в VSA 99\n"
-                "• Бот, мой рекорд в H2H 99\n\n"
-                "📝 Примеры команд:\n"
-                "• Бот, мой ник SuperTeam\n"
-                "• Бот, мой рекорд в VSA 85\n"
-                "• Бот, мой рекорд в H2H 78\n\n"
-                "⚠️ После регистрации ожидайте подтверждения от администратора."
-            )
-            await update.message.reply_text(help_text)
+            await update.message.reply_text(_HELP_USER_RU)
     
+    @admin_required
     async def handle_command(self, update, context):
         """Обработка команды /command (только для админов)"""
-        user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
-        
-        if not await self.is_admin(update, context):
-            error_text = self.localizer.get_text("admin_only", lang)
-            await update.message.reply_text(error_text)
-            return
-        
-        await update.message.reply_text(
-            "🎮 Команды администратора:\n\n"
-            "/start - Запуск бота\n"
-            "/help - Помощь\n"
-            "/list - Список всех игроков\n"
-            "/stats - Статистика турнира\n"
-            "/clear confirm - Очистить все данные\n"
-            "/command - Показать эту справку\n\n"
-            "📝 Для подтверждения регистрации:\n"
-            "Напишите: 'подтвердить @username'"
-        )
+        await update.message.reply_text(_ADMIN_COMMANDS_RU)
     
+    @admin_required
     async def handle_list(self, update, context):
         """Обработка команды /list (только для админов)"""
         user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
         
-        if not await self.is_admin(update, context):
-            error_text = self.localizer.get_text("admin_only", lang)
-            await update.message.reply_text(error_text)
-            return
+        # Пересобираем список только после изменений в хранилище
+        version = self.storage.version
+        if self._list_cache is None or self._list_cache[0] != version:
+            self._list_cache = (version, split_message(self.render_player_list()))
+        
+        # Длинный список уходит несколькими сообщениями по порядку
+        for part in self._list_cache[1]:
+            await update.message.reply_text(part)
         
+        logger.info("Админ %s запросил список игроков", user.username)
+    
+    def render_player_list(self) -> str:
+        """Текст списка игроков и ожидающих подтверждения"""
+        # Оба вызова возвращают представления данных в памяти без I/O,
+        # поэтому параллельный запуск через TaskGroup ничего не дал бы
         players = self.storage.get_all_players()
         temp_registrations = self.storage.get_temp_registrations()
         
-        message_parts = []
-        
-        # VSA Турнир
-        vsa_players = players.get("vsa", {})
-        if vsa_players:
-            message_parts.append("🏆 VSA Турнир:")
-            for username, data in vsa_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username}: {data['name']} ({data['stars']} ⭐)")
-        else:
-            message_parts.append("🏆 VSA Турнир: Нет регистраций")
-        
-        message_parts.append("")
-        
-        # H2H Турнир
-        h2h_players = players.get("h2h", {})
-        if h2h_players:
-            message_parts.append("⚔️ H2H Турнир:")
-            for username, data in h2h_players.items():
-                status = "✅" if data.get("confirmed") else "⏳"
-                message_parts.append(f"{status} {username}: {data['name']} ({data['stars']} ⭐)")
-        else:
-            message_parts.append("⚔️ H2H Турнир: Нет регистраций")
+        lines = []
+        
+        # Турниры: заголовок и по строке на игрока
+        for tournament_type, header, empty in _LIST_SECTIONS:
+            tournament_players = players.get(tournament_type, {})
+            if lines:
+                lines.append("")
+            if not tournament_players:
+                lines.append(empty)
+                continue
+            lines.append(header)
+            lines.extend(
+                f"{_OK if confirmed else _WAIT} {player.get('username', username)}: {name} ({stars} ⭐)"
+                for (username, player), (confirmed, name, stars) in zip(
+                    tournament_players.items(), map(_player_fields, tournament_players.values())
+                )
+            )
         
         # Ожидающие подтверждения
         if temp_registrations:
-            message_parts.append("")
-            message_parts.append("⏳ Ожидают подтверждения:")
-            for user_id, data in temp_registrations.items():
-                username = data.get("username", "Неизвестный")
-                tournament = data.get("tournament_type", "unknown").upper()
-                team_name = data.get("team_name", "Неизвестно")
-                rating = data.get("rating", 0)
-                message_parts.append(f"• @{username} - {tournament}: {team_name} ({rating} ⭐)")
-        
-        final_message = "\n".join(message_parts) if message_parts else "Регистраций не найдено"
-        await update.message.reply_text(final_message)
-        
-        logger.info(f"Админ {user.username} запросил список игроков")
+            lines.append("")
+            lines.append(f"{_WAIT} Ожидают подтверждения:")
+            lines.extend(map(_pending_line, temp_registrations.values()))
+        
+        return "\n".join(lines)
     
+    @admin_required
     async def handle_stats(self, update, context):
         """Обработка команды /stats (только для админов)"""
         user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
-        
-        if not await self.is_admin(update, context):
-            error_text = self.localizer.get_text("admin_only", lang)
-            await update.message.reply_text(error_text)
-            return
         
         stats = self.storage.get_statistics()
         
@@ -200,31 +317,23 @@ class WorkingTournamentBot:
         ]
         
         await update.message.reply_text("\n".join(message_parts))
-        logger.info(f"Админ {user.username} запросил статистику")
+        logger.info("Админ %s запросил статистику", user.username)
     
+    @admin_required
     async def handle_clear(self, update, context):
         """Обработка команды /clear (только для админов)"""
         user = update.effective_user
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
-        
-        if not await self.is_admin(update, context):
-            error_text = self.localizer.get_text("admin_only", lang)
-            await update.message.reply_text(error_text)
-            return
         
         # Проверка подтверждения
         args = context.args
         if not args or args[0].lower() != "confirm":
-            await update.message.reply_text(
-                "⚠️ Для очистки данных используйте: /clear confirm\n"
-                "Это действие необратимо!"
-            )
+            await update.message.reply_text(_CLEAR_CONFIRM_HELP_RU)
             return
         
         try:
-            self.storage.clear_all_data()
+            await self.storage.clear_all_data_async()
             await update.message.reply_text("✅ Все данные турнира очищены")
-            logger.info(f"Админ {user.username} очистил все данные")
+            logger.info("Админ %s очистил все данные", user.username)
         except Exception as e:
             await update.message.reply_text(f"❌ Ошибка при очистке данных: {e}")
     
@@ -232,9 +341,11 @@ class WorkingTournamentBot:
         """Обработка сообщений на естественном языке"""
         user = update.effective_user
         message_text = update.message.text
-        lang = 'ru' if user.language_code and user.language_code.startswith('ru') else 'en'
+        lang = self._lang(user)
         
-        logger.info(f"Обработка сообщения от {user.username or user.first_name or 'Unknown'}: {message_text}")
+        # Логируется каждое сообщение, поэтому при выключенном INFO не собираем аргументы
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Обработка сообщения от %s: %s", self._display_name(user), message_text)
         
         try:
             # Сначала проверяем, является ли это ответом на сообщение для подтверждения
@@ -245,37 +356,20 @@ class WorkingTournamentBot:
             # Парсинг сообщения через NLP процессор
             parsed_command = self.nlp.parse_message(message_text, lang)
             
-            logger.info(f"Parsed command: {parsed_command}")
+            logger.info("Parsed command: %s", parsed_command)
             
             if not parsed_command:
-                help_text = (
-                    "❓ Не понял команду. Используйте:\n\n"
-                    "🔸 Бот, мой ник НазваниеКоманды\n"
-                    "🔸 Бот, мой рекорд в VSA 99\n"
-                    "🔸 Бот, мой рекорд в H2H 99\n\n"
-                    "Или отправьте /help для подробной справки."
-                )
-                await update.message.reply_text(help_text)
+                await update.message.reply_text(_UNKNOWN_COMMAND_RU)
                 return
             
-            command_type = parsed_command.get("type")
-            
-            if command_type == "set_team_name":
-                await self.handle_team_name(update, context, parsed_command["team_name"], lang)
-            
-            elif command_type == "set_vsa_rating":
-                await self.handle_rating(update, context, "vsa", parsed_command["rating"], lang)
-            
-            elif command_type == "set_h2h_rating":
-                await self.handle_rating(update, context, "h2h", parsed_command["rating"], lang)
-            
-            elif command_type == "admin_confirm":
-                await self.handle_admin_confirm(update, context, parsed_command["username"], lang)
+            entry = self._nlp_dispatch.get(parsed_command.get("type"))
+            if entry:
+                key, handler = entry
+                await handler(update, context, parsed_command[key], lang)
             
         except Exception as e:
-            logger.error(f"Ошибка при обработке сообщения: {e}")
-            error_text = self.localizer.get_text("processing_error", lang)
-            await update.message.reply_text(error_text)
+            logger.error("Ошибка при обработке сообщения: %s", e)
+            await update.message.reply_text(self._processing_error[lang])
     
     async def handle_team_name(self, update, context, team_name: str, lang: str):
         """Обработка установки названия команды"""
@@ -284,17 +378,18 @@ class WorkingTournamentBot:
         try:
             validate_team_name(team_name)
             
-            if "registration_data" not in context.user_data:
-                context.user_data["registration_data"] = {}
+            draft = context.user_data.get("registration_data")
+            if draft is None:
+                draft = context.user_data["registration_data"] = RegistrationDraft()
             
-            context.user_data["registration_data"]["team_name"] = team_name
-            context.user_data["registration_data"]["timestamp"] = datetime.now()
+            draft.team_name = team_name
+            draft.timestamp = time.monotonic()
             
             success_text = self.localizer.get_text("team_name_saved", lang, team_name=team_name)
-            next_step_text = self.localizer.get_text("next_step_rating", lang)
+            next_step_text = self._next_step_rating[lang]
             
             await update.message.reply_text(f"{success_text}\n\n{next_step_text}")
-            logger.info(f"Пользователь {user.username or user.first_name or 'Unknown'} установил название команды: {team_name}")
+            logger.info("Пользователь %s установил название команды: %s", self._display_name(user), team_name)
             
         except ValidationError as e:
             error_text = self.localizer.get_text("validation_error", lang, error=str(e))
@@ -307,27 +402,30 @@ class WorkingTournamentBot:
         try:
             validate_rating(rating)
             
-            registration_data = context.user_data.get("registration_data", {})
-            if "team_name" not in registration_data:
-                error_text = self.localizer.get_text("team_name_required", lang)
-                await update.message.reply_text(error_text)
+            draft = context.user_data.get("registration_data")
+            if draft is None or draft.team_name is None:
+                await update.message.reply_text(self._team_name_required[lang])
                 return
             
-            team_name = registration_data["team_name"]
+            team_name = draft.team_name
             
-            success = await self.storage.save_temp_registration(
+            # Проверки и запись в память сразу, сохранение на диск параллельно с ответом
+            success = self.storage.save_temp_registration_sync(
                 user_id=user.id,
-                username=user.username or user.first_name or "Unknown",
+                username=self._display_name(user),
                 tournament_type=tournament_type,
                 team_name=team_name,
                 rating=rating
             )
             
             if success:
-                success_text = self.localizer.get_text("rating_saved", lang, tournament=tournament_type.upper(), rating=rating)
-                confirm_text = self.localizer.get_text("awaiting_confirmation", lang)
-                await update.message.reply_text(f"{success_text}\n\n{confirm_text}")
-                logger.info(f"Пользователь {user.username or user.first_name or 'Unknown'} зарегистрировался на {tournament_type}: {rating}")
+                success_text = self.localizer.get_text("rating_saved", lang, tournament=tournament_label(tournament_type), rating=rating)
+                confirm_text = self._awaiting_confirmation[lang]
+                await asyncio.gather(
+                    update.message.reply_text(f"{success_text}\n\n{confirm_text}"),
+                    self.storage.flush_async()
+                )
+                logger.info("Пользователь %s зарегистрировался на %s: %s", self._display_name(user), tournament_type, rating)
             else:
                 error_text = "Регистрация не удалась. Возможно, вы уже зарегистрированы на этот турнир."
                 await update.message.reply_text(error_text)
@@ -336,37 +434,30 @@ class WorkingTournamentBot:
             error_text = self.localizer.get_text("validation_error", lang, error=str(e))
             await update.message.reply_text(error_text)
     
+    @admin_required
     async def handle_admin_confirm(self, update, context, target_username: str, lang: str):
         """Обработка подтверждения администратором"""
         user = update.effective_user
         
-        if not await self.is_admin(update, context):
-            error_text = self.localizer.get_text("admin_only", lang)
-            await update.message.reply_text(error_text)
-            return
-        
-        # Поиск ожидающей регистрации
-        temp_registrations = self.storage.get_temp_registrations()
-        target_data = None
-        target_user_id = None
-        
-        for user_id, data in temp_registrations.items():
-            if data.get("username", "").lower() == target_username.lower():
-                target_data = data
-                target_user_id = user_id
-                break
-        
-        if not target_data:
+        # Поиск ожидающей регистрации по индексу имён вместо перебора всех
+        matches = self.storage.find_temp_registrations(target_username)
+        if not matches:
             error_text = f"Не найдено ожидающих регистраций для @{target_username}"
             await update.message.reply_text(error_text)
             return
         
-        success = self.storage.confirm_registration(target_user_id)
+        target_user_id, target_data = matches[0]
+        
+        success = await self.storage.confirm_registration_async(target_user_id)
         
         if success:
-            success_text = f"✅ Регистрация подтверждена для @{target_username} в {target_data['tournament_type'].upper()}: {target_data['team_name']}"
+            success_text = _CONFIRMED_RU(
+                username=target_username,
+                tournament=tournament_label(target_data["tournament_type"]),
+                team_name=target_data["team_name"]
+            )
             await update.message.reply_text(success_text)
-            logger.info(f"Админ {user.username} подтвердил регистрацию для {target_username}")
+            logger.info("Админ %s подтвердил регистрацию для %s", user.username, target_username)
         else:
             await update.message.reply_text("Не удалось подтвердить регистрацию.")
 
@@ -383,19 +474,15 @@ class WorkingTournamentBot:
         
         # Извлекаем информацию из сообщения, на которое отвечаем
         reply_text = update.message.reply_to_message.text
-        current_text = update.message.text.lower()
         
         # Проверяем, содержит ли ответ подтверждение
-        if "подтвердить" in current_text or "подтверждаю" in current_text or "да" in current_text:
+        if _CONFIRM_RE.search(update.message.text):
             # Ищем username в исходном сообщении
-            import re
-            username_match = re.search(r'@(\w+)', reply_text)
+            username_match = _MENTION_RE.search(reply_text)
             if username_match:
                 username = username_match.group(1)
                 await self.handle_admin_confirm(update, context, username, 'ru')
     
-    
-    
     async def run(self):
         """Запуск бота"""
         if not TELEGRAM_AVAILABLE:
@@ -409,14 +496,23 @@ class WorkingTournamentBot:
         logger.info("Запуск турнирного бота...")
         
         # Создание приложения
-        application = Application.builder().token(self.token).build()
+        # Один пул keep-alive соединений к Bot API, рассчитанный на параллельные ответы
+        application = (
+            Application.builder()
+            .token(self.token)
+            .connection_pool_size(32)
+            .pool_timeout(30)
+            .read_timeout(20)
+            .write_timeout(20)
+            .build()
+        )
         
         # Убираем команды из меню Telegram
         try:
             await application.bot.set_my_commands([])
             logger.info("Команды бота очищены")
         except Exception as e:
-            logger.error(f"Ошибка при настройке команд: {e}")
+            logger.error("Ошибка при настройке команд: %s", e)
         
         # Добавление обработчиков команд (только для админов)
         application.add_handler(CommandHandler("start", self.handle_start))
@@ -430,7 +526,7 @@ class WorkingTournamentBot:
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
         # Запуск периодической очистки
-        asyncio.create_task(self.storage.periodic_cleanup())
+        self.storage.start_cleanup()
         
         # Запуск бота с правильным управлением lifecycle
         try:
@@ -449,39 +545,42 @@ class WorkingTournamentBot:
                     await application.stop()
                     
         except Exception as e:
-            logger.error(f"Ошибка при запуске polling: {e}")
+            logger.error("Ошибка при запуске polling: %s", e)
             raise
+        finally:
+            await self.storage.stop_cleanup()
 
 def main():
     """Точка входа"""
     if not TELEGRAM_AVAILABLE:
-        print("Библиотека Telegram недоступна. Проверьте установку.")
-        return
+        raise SystemExit(
+            "Библиотека Telegram недоступна. Проверьте установку "
+            "или запустите simple_production_demo.py для демо без Telegram."
+        )
     
     try:
         bot = WorkingTournamentBot()
         
         # Проверяем, есть ли уже запущенный event loop (как в Replit)
         try:
-            loop = asyncio.get_running_loop()
+            asyncio.get_running_loop()
             # Если event loop уже запущен, создаем задачу
             task = asyncio.create_task(bot.run())
             logger.info("Бот запущен как задача в существующем event loop")
             return task
         except RuntimeError:
-            # Если нет активного event loop, создаем новый
-            asyncio.run(bot.run())
+            # Если нет активного event loop, создаем новый;
+            # nest_asyncio не умеет патчить uvloop, поэтому uvloop только без него
+            run(bot.run, use_uvloop=not os.getenv("NEST_ASYNCIO"))
             
     except Exception as e:
-        logger.error(f"Не удалось запустить бота: {e}")
+        logger.error("Не удалось запустить бота: %s", e)
         raise
 
 if __name__ == "__main__":
-    import nest_asyncio
-    try:
-        # Разрешаем вложенные event loops для совместимости с Replit
+    if os.getenv("NEST_ASYNCIO"):
+        # Вложенные event loops нужны только в Replit/Jupyter: патч замедляет каждый await
+        import nest_asyncio
         nest_asyncio.apply()
-    except:
-        pass
-    
+
     main()